@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from .base_agent import BaseLMSAgent, AgentFactory, AgentSession, Assignment, Course
 from .visual_agent import VisualBrowserAgent
 from .assignment_parser import IntelligentAssignmentParser
-from .memory_system import LearningAwareAgent, VectorMemoryStore, AdaptiveLearningEngine
+from .memory_system import LearningAwareAgent, AdaptiveLearningEngine, get_memory_store
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +40,8 @@ class AIAgentOrchestrator:
 
         # Initialize core components
         self.memory_dir = Path(config.get('memory_dir', Path.home() / ".academic_assistant" / "memory"))
-        self.memory_store = VectorMemoryStore(self.memory_dir)
+        # Shared with the LearningAwareAgents built on the same directory
+        self.memory_store = get_memory_store(self.memory_dir)
         self.learning_engine = AdaptiveLearningEngine(self.memory_store)
         self.assignment_parser = IntelligentAssignmentParser(ai_client)
 
@@ -77,6 +78,8 @@ class AIAgentOrchestrator:
             if hasattr(agent, 'cleanup'):
                 await agent.cleanup()
 
+        self.memory_store.close()
+
     # LEARNING CONCEPT 2: Intelligent Platform Detection
     # Instead of requiring manual configuration, the system can auto-detect platforms
 
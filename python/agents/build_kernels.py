@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time build for the risk scoring kernels
+Teaching concepts: AOT compilation, Shipping native extensions, Zero-warmup startup
+
+Run once per platform from the python/ directory (needs numba and a C compiler):
+
+    python -m agents.build_kernels
+
+This writes a `_risk_kernels_aot` extension module next to this file.
+`_risk_kernels` imports it when present, so the assistant starts without
+paying Numba's JIT compile on the first prediction. Without the extension
+it falls back to the JIT, then to plain NumPy.
+"""
+
+import os
+import sys
+
+from numba.pycc import CC
+
+# The kernel source is shared with the runtime module, not duplicated here
+from ._risk_kernels import _daily_load_loop, _score_deadlines_loop
+
+cc = CC('_risk_kernels_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# (days int64[:], hours float64[:], completion_rate, stress) -> (probability, severity code)
+cc.export('score_deadlines', 'Tuple((f8[:], i1[:]))(i8[:], f8[:], f8, f8)')(_score_deadlines_loop)
+
+# (days_available int64[:], hours_per_day float64[:], horizon) -> load per day
+cc.export('daily_load', 'f8[:](i8[:], f8[:], i8)')(_daily_load_loop)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Built {cc.name} in {cc.output_dir}")
+    sys.exit(0)
@@ -4,15 +4,19 @@ Intelligent Event Management & Study Scheduling
 Teaching concepts: Calendar APIs, Time Series Analysis, Pattern Recognition, ML Scheduling
 """
 
+import hashlib
 import json
+import re
+import threading
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta, time
 from pathlib import Path
 import logging
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
 import statistics
-from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum, IntEnum
 
 # For calendar integration
 try:
@@ -192,7 +196,7 @@ class CalendarClient:
 
         This demonstrates:
         - CalDAV event querying
-        - iCalendar parsing
+        - iCalendar parsing (parallelized across events)
         - Date range filtering
         """
         calendars = self.get_calendars()
@@ -214,10 +218,13 @@ class CalendarClient:
                     expand=True
                 )
 
-                for event in events:
-                    parsed = self._parse_caldav_event(event)
-                    if parsed:
-                        all_events.append(parsed)
+                if not events:
+                    continue
+
+                # Parsing is independent per event; executor.map keeps order
+                with ThreadPoolExecutor(max_workers=min(8, len(events))) as executor:
+                    parsed_events = executor.map(self._parse_caldav_event, events)
+                    all_events.extend(parsed for parsed in parsed_events if parsed)
 
             except Exception as e:
                 logger.error(f"Error fetching events from {calendar.name}: {e}")
@@ -236,27 +243,106 @@ class CalendarClient:
         """
         try:
             # Get iCalendar data
-            ical_data = caldav_event.data
-            calendar = Calendar.from_ical(ical_data)
-
-            # Extract VEVENT component
-            for component in calendar.walk():
-                if component.name == "VEVENT":
-                    return {
-                        'title': str(component.get('summary', 'No Title')),
-                        'start_time': component.get('dtstart').dt,
-                        'end_time': component.get('dtend').dt,
-                        'description': str(component.get('description', '')),
-                        'location': str(component.get('location', '')),
-                        'uid': str(component.get('uid', ''))
-                    }
-
-            return None
+            parsed = _parse_ical_data(caldav_event.data)
+            return dict(parsed) if parsed else None
 
         except Exception as e:
             logger.error(f"Error parsing event: {e}")
             return None
 
+
+# Parsed VEVENTs by event identity (see _event_cache_key), least recent first.
+# Shared by fetch_events' parser threads, hence the lock.
+_PARSED_EVENTS: OrderedDict = OrderedDict()
+_PARSED_EVENTS_LOCK = threading.Lock()
+_PARSED_EVENTS_SIZE = 1024
+
+# Properties that identify one version of one occurrence of an event
+_EVENT_KEY_PROPERTIES = ('UID', 'RECURRENCE-ID', 'LAST-MODIFIED', 'SEQUENCE')
+
+# RFC 5545 line folding: CRLF (or LF) followed by a space or tab
+_ICAL_FOLD = re.compile(r'\r?\n[ \t]')
+
+
+def _event_cache_key(ical_data) -> Optional[Tuple[str, ...]]:
+    """
+    Identity of the payload's first VEVENT, read without a full parse
+
+    The UID, RECURRENCE-ID, LAST-MODIFIED and SEQUENCE lines (parameters
+    included) of the first VEVENT plus a digest of all its lines, so an
+    edit that leaves LAST-MODIFIED and SEQUENCE alone still misses. None
+    if it has no UID, so the payload is parsed uncached.
+    """
+    if isinstance(ical_data, bytes):
+        ical_data = ical_data.decode('utf-8', errors='replace')
+
+    found: Dict[str, str] = {}
+    digest = hashlib.blake2b(digest_size=16)
+    depth = 0  # 1 inside the VEVENT, deeper inside its VALARMs
+    for line in _ICAL_FOLD.sub('', ical_data).splitlines():
+        name = line.split(':', 1)[0].split(';', 1)[0].upper()
+        if name == 'BEGIN':
+            if depth or line[6:].strip().upper() == 'VEVENT':
+                depth += 1
+        elif name == 'END' and depth:
+            depth -= 1
+            if not depth:
+                break
+        elif depth == 1 and name in _EVENT_KEY_PROPERTIES:
+            found[name] = line
+        if depth:
+            digest.update(line.encode('utf-8', errors='replace') + b'\n')
+
+    if 'UID' not in found:
+        return None
+    return tuple(found.get(name, '') for name in _EVENT_KEY_PROPERTIES) + (digest.hexdigest(),)
+
+
+def _parse_ical_data(ical_data) -> Optional[Dict[str, Any]]:
+    """
+    Parse the first VEVENT of an iCalendar payload
+
+    Memoized on the event's identity rather than the payload: a small key
+    per occurrence, so re-fetching an overlapping date range (every sync)
+    skips the parse, and any edit to the event's lines misses. Callers must copy the returned dict before mutating it.
+    """
+    key = _event_cache_key(ical_data)
+    if key is None:
+        return _parse_vevent(ical_data)
+
+    with _PARSED_EVENTS_LOCK:
+        if key in _PARSED_EVENTS:
+            _PARSED_EVENTS.move_to_end(key)
+            return _PARSED_EVENTS[key]
+
+    parsed = _parse_vevent(ical_data)
+
+    with _PARSED_EVENTS_LOCK:
+        _PARSED_EVENTS[key] = parsed
+        if len(_PARSED_EVENTS) > _PARSED_EVENTS_SIZE:
+            _PARSED_EVENTS.popitem(last=False)
+    return parsed
+
+
+def _parse_vevent(ical_data) -> Optional[Dict[str, Any]]:
+    """Fields of the first VEVENT in an iCalendar payload"""
+    calendar = Calendar.from_ical(ical_data)
+
+    # Extract VEVENT component
+    for component in calendar.walk():
+        if component.name == "VEVENT":
+            return {
+                'title': str(component.get('summary', 'No Title')),
+                'start_time': component.get('dtstart').dt,
+                'end_time': component.get('dtend').dt,
+                'description': str(component.get('description', '')),
+                'location': str(component.get('location', '')),
+                'uid': str(component.get('uid', ''))
+            }
+
+    return None
+
+
 # LEARNING CONCEPT 3: Time Series Analysis for Pattern Recognition
 # Analyze user behavior patterns to optimize scheduling
 
@@ -431,6 +517,22 @@ class ProductivityAnalyzer:
 # LEARNING CONCEPT 4: Intelligent Scheduling Algorithm
 # ML-based scheduling that optimizes for productivity and constraints
 
+class AssignmentType(IntEnum):
+    """Assignment categories, used as indices into BUFFERED_BASE_TIMES"""
+    homework = 0
+    project = 1
+    essay = 2
+    exam = 3
+    lab = 4
+    quiz = 5
+    other = 6
+
+# Base study hours per AssignmentType (exam = study time), with the 20%
+# scheduling buffer folded in so estimation is a single multiply per call
+BUFFERED_BASE_TIMES: Tuple[float, ...] = tuple(
+    hours * 1.2 for hours in (3.0, 15.0, 8.0, 10.0, 4.0, 1.0, 5.0)
+)
+
 class IntelligentScheduler:
     """
     AI-powered scheduler that optimizes study time
@@ -567,19 +669,9 @@ class IntelligentScheduler:
         LEARNING CONCEPT: Parametric Estimation
         Use multiple factors to estimate effort
         """
-        # Base time by assignment type
-        base_times = {
-            'homework': 3.0,
-            'project': 15.0,
-            'essay': 8.0,
-            'exam': 10.0,  # Study time
-            'lab': 4.0,
-            'quiz': 1.0,
-            'other': 5.0
-        }
-
-        assignment_type = assignment.get('type', 'other')
-        base_time = base_times.get(assignment_type, 5.0)
+        assignment_type = AssignmentType.__members__.get(
+            assignment.get('type', 'other'), AssignmentType.other
+        )
 
         # Adjust for difficulty
         difficulty = assignment.get('difficulty', 0.5)
@@ -588,10 +680,8 @@ class IntelligentScheduler:
         # Adjust for course
         course_multiplier = assignment.get('course_multiplier', 1.0)
 
-        total_hours = base_time * difficulty_multiplier * course_multiplier
-
-        # Add buffer (20%)
-        total_hours *= 1.2
+        # Base time already includes the 20% buffer
+        total_hours = BUFFERED_BASE_TIMES[assignment_type] * difficulty_multiplier * course_multiplier
 
         return total_hours
 
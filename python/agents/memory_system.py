@@ -4,26 +4,50 @@ Agent Memory and Learning System
 Teaching concepts: Vector Databases, Machine Learning, Pattern Recognition, Caching
 """
 
+import os
 import json
 import sqlite3
+import struct
+import functools
 import hashlib
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
 import pickle
 import logging
+import threading
+import weakref
 from collections import defaultdict, Counter
 
 # For vector similarity (in production, use proper vector DB like Pinecone/Weaviate)
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    from sklearn.cluster import KMeans
+    import scipy.sparse
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.cluster import MiniBatchKMeans
 except ImportError:
     print("Install scikit-learn: pip install scikit-learn")
 
+# Optional fast serialization/hashing for strategy fingerprints (falls back to json + MD5)
+try:
+    import orjson
+    import xxhash
+except ImportError:
+    orjson = xxhash = None
+
+# Optional MinHash LSH for near-duplicate detection (falls back to a linear scan)
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:
+    MinHash = MinHashLSH = None
+
+# Optional JIT for the strategy scoring kernel (runs as plain Python without it)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 # LEARNING CONCEPT 1: Vector Database Concepts
@@ -43,13 +67,18 @@ class NavigationPattern:
     usage_count: int = 0
     avg_execution_time: float = 0.0
 
+    # Memoized to_vector_text(); reset to None if the text fields change
+    _vector_text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
     def to_vector_text(self) -> str:
         """Convert pattern to text for vectorization"""
-        steps_text = " ".join([
-            f"{step.get('action', '')} {step.get('target', '')} {step.get('reasoning', '')}"
-            for step in self.successful_steps
-        ])
-        return f"{self.platform} {self.goal} {self.page_context} {steps_text}"
+        if self._vector_text is None:
+            steps_text = " ".join([
+                f"{step.get('action', '')} {step.get('target', '')} {step.get('reasoning', '')}"
+                for step in self.successful_steps
+            ])
+            self._vector_text = f"{self.platform} {self.goal} {self.page_context} {steps_text}"
+        return self._vector_text
 
 @dataclass
 class LearningContext:
@@ -68,49 +97,107 @@ class VectorMemoryStore:
     Vector-based memory store for semantic pattern matching
 
     Teaching Concepts:
-    - TF-IDF for text vectorization
+    - Feature hashing for text vectorization
     - Cosine similarity for pattern matching
     - Clustering for pattern discovery
     - Dimensionality reduction concepts
     """
 
-    def __init__(self, memory_dir: Path):
+    # Scale used to quantize L2-normalized weights into int8
+    INT8_SCALE = 127
+
+    def __init__(self, memory_dir: Path, precision: str = 'fp32'):
+        """
+        Args:
+            precision: 'fp32' stores float32 vectors; 'int8' quantizes them
+                for ranking at a quarter of the float32 memory bandwidth
+        """
+        if precision not in ('fp32', 'int8'):
+            raise ValueError(f"Unknown precision: {precision}")
+
         self.memory_dir = memory_dir
         self.memory_dir.mkdir(exist_ok=True)
+        self.precision = precision
 
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
+        # Stateless: new text never requires a refit, so existing rows stay valid
+        self.vectorizer = HashingVectorizer(
+            n_features=1 << 14,
             stop_words='english',
-            ngram_range=(1, 3)  # Capture phrases like "click submit button"
+            ngram_range=(1, 3),   # Capture phrases like "click submit button"
+            alternate_sign=False,
+            norm='l2',            # Rows come out ready for cosine similarity
+            dtype=np.float32      # Cosine ranking doesn't need float64
         )
 
         self.patterns: List[NavigationPattern] = []
         self.pattern_vectors = None
-        self.clusterer = KMeans(n_clusters=10, random_state=42)
+        self.clusterer = MiniBatchKMeans(n_clusters=10, batch_size=256, n_init=3, random_state=42)
+
+        # Guards pattern/array updates when agents share this store
+        self._lock = threading.RLock()
+
+        # Patterns appended since the last clustering pass
+        self._dirty_count = 0
+
+        # (platform, goal) -> row indices into pattern_vectors
+        self._bucket_rows: Dict[Tuple[str, str], np.ndarray] = {}
+
+        # Per-instance LRU of vectorized query contexts
+        self._vectorize_query = functools.lru_cache(maxsize=1024)(self._transform_query)
+
+        # (platform, goal) -> MinHash LSH index of pattern indices, for dedupe
+        self._lsh: Dict[Tuple[str, str], Any] = {}
+
+        # Columnar copies of the scalar fields read when scoring strategies
+        self._sr = np.empty(0, dtype=np.float32)   # success_rate
+        self._uc = np.empty(0, dtype=np.int32)     # usage_count
+        self._ts = np.empty(0, dtype=np.int64)     # timestamp (unix seconds)
+        self._et = np.empty(0, dtype=np.float64)   # avg_execution_time
+        self._platforms = np.empty(0, dtype=object)
+        self._goals = np.empty(0, dtype=object)
+
+        # Append-only log of pattern writes since the last snapshot
+        self._log_path = self.memory_dir / "navigation_patterns.log"
+        self._log_records = 0
 
         self.load_patterns()
+        self._log = open(self._log_path, 'ab', buffering=0)
+        self._rebuild_columns()
         self._rebuild_vectors()
+        self._rebuild_dedupe_index()
 
     def add_pattern(self, pattern: NavigationPattern) -> None:
         """Add a new successful pattern to memory"""
-        # Check for duplicates or similar patterns
-        similar_idx = self._find_similar_pattern(pattern)
-
-        if similar_idx is not None:
-            # Update existing pattern with new data
-            existing = self.patterns[similar_idx]
-            existing.usage_count += 1
-            existing.success_rate = (existing.success_rate + pattern.success_rate) / 2
-            existing.avg_execution_time = (
-                existing.avg_execution_time + pattern.avg_execution_time
-            ) / 2
-            existing.timestamp = pattern.timestamp
-        else:
-            # Add as new pattern
-            self.patterns.append(pattern)
-
-        self._rebuild_vectors()
-        self.save_patterns()
+        with self._lock:
+            # Check for duplicates or similar patterns
+            similar_idx = self._find_similar_pattern(pattern)
+
+            if similar_idx is not None:
+                # Update existing pattern with new data
+                existing = self.patterns[similar_idx]
+                existing.usage_count += 1
+                existing.success_rate = (existing.success_rate + pattern.success_rate) / 2
+                existing.avg_execution_time = (
+                    existing.avg_execution_time + pattern.avg_execution_time
+                ) / 2
+                existing.timestamp = pattern.timestamp
+                self._sr[similar_idx] = existing.success_rate
+                self._uc[similar_idx] = existing.usage_count
+                self._ts[similar_idx] = int(existing.timestamp.timestamp())
+                self._et[similar_idx] = existing.avg_execution_time
+                self._append_to_log(similar_idx, existing)
+            else:
+                # Add as new pattern
+                self.patterns.append(pattern)
+                self._index_for_dedupe(len(self.patterns) - 1)
+                self._sr = np.append(self._sr, np.float32(pattern.success_rate))
+                self._uc = np.append(self._uc, np.int32(pattern.usage_count))
+                self._ts = np.append(self._ts, np.int64(pattern.timestamp.timestamp()))
+                self._et = np.append(self._et, pattern.avg_execution_time)
+                self._platforms = np.append(self._platforms, np.array([pattern.platform], dtype=object))
+                self._goals = np.append(self._goals, np.array([pattern.goal], dtype=object))
+                self._append_vector(pattern)
+                self._append_to_log(len(self.patterns) - 1, pattern)
 
     def find_similar_patterns(self,
                             context: str,
@@ -123,39 +210,91 @@ class VectorMemoryStore:
         This is the key innovation: instead of exact matching,
         we find semantically similar navigation contexts
         """
+        indices, similarities = self.find_similar_indices(context, platform, goal, top_k)
+        return [
+            (self.patterns[idx], sim)
+            for idx, sim in zip(indices.tolist(), similarities.tolist())
+        ]
+
+    def find_similar_indices(self,
+                             context: str,
+                             platform: str = None,
+                             goal: str = None,
+                             top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Same search as find_similar_patterns, but returns parallel arrays of
+        pattern indices and similarity scores (best first) for vectorized callers
+        """
+        with self._lock:
+            return self._find_similar_indices(context, platform, goal, top_k)
+
+    def _find_similar_indices(self,
+                              context: str,
+                              platform: Optional[str],
+                              goal: Optional[str],
+                              top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        no_match = (np.empty(0, dtype=np.intp), np.empty(0))
         if not self.patterns or self.pattern_vectors is None:
-            return []
-
-        # Vectorize the query context
-        query_vector = self.vectorizer.transform([context])
-
-        # Calculate similarities
-        similarities = cosine_similarity(query_vector, self.pattern_vectors)[0]
-
-        # Get top matches
-        top_indices = np.argsort(similarities)[::-1][:top_k]
-
-        results = []
-        for idx in top_indices:
-            pattern = self.patterns[idx]
-            similarity_score = similarities[idx]
-
-            # Apply filters if specified
-            if platform and pattern.platform != platform:
-                continue
-            if goal and pattern.goal != goal:
-                continue
-
-            # Only return patterns with reasonable similarity
-            if similarity_score > 0.1:  # Threshold for relevance
-                results.append((pattern, similarity_score))
-
-        return results
+            return no_match
+
+        # Restrict the search to matching (platform, goal) buckets up front
+        rows = self._rows_matching(platform, goal)
+        if rows is not None and rows.size == 0:
+            return no_match
+        vectors = self.pattern_vectors if rows is None else self.pattern_vectors[rows]
+
+        # Vectorize the query context (cached: URL contexts recur heavily)
+        query_vector = self._vectorize_query(context)
+
+        # Rows are stored L2-normalized, so cosine similarity is one sparse matvec
+        if self.precision == 'int8':
+            # Accumulate in int32, then undo both operands' quantization scale
+            similarities = np.asarray(
+                vectors.dot(query_vector.T.astype(np.int32)).todense()
+            ).ravel() / self.INT8_SCALE ** 2
+        else:
+            similarities = np.asarray(vectors.dot(query_vector.T).todense()).ravel()
+
+        # Only rank patterns with reasonable similarity
+        candidates = np.flatnonzero(similarities > 0.1)  # Threshold for relevance
+        if candidates.size == 0:
+            return no_match
+
+        # Get top matches: O(N) partition, then sort just the k winners
+        k = min(top_k, candidates.size)
+        top_candidates = candidates[np.argpartition(similarities[candidates], -k)[-k:]]
+        top_indices = top_candidates[np.argsort(similarities[top_candidates])[::-1]]
+
+        # Map slice positions back to pattern indices
+        pattern_indices = top_indices if rows is None else rows[top_indices]
+        return pattern_indices, similarities[top_indices]
+
+    def _transform_query(self, context: str):
+        """Vectorize and quantize a query context"""
+        return self._vectorize([context])
+
+    def _rows_matching(self, platform: Optional[str], goal: Optional[str]) -> Optional[np.ndarray]:
+        """Row indices for the given filters, or None when unfiltered"""
+        if platform and goal:
+            return self._bucket_rows.get((platform, goal), np.empty(0, dtype=np.intp))
+        if platform:
+            return np.flatnonzero(self._platforms == platform)
+        if goal:
+            return np.flatnonzero(self._goals == goal)
+        return None
 
     def _find_similar_pattern(self, new_pattern: NavigationPattern) -> Optional[int]:
         """Find if a very similar pattern already exists"""
         new_text = new_pattern.to_vector_text()
 
+        if MinHashLSH is not None:
+            # Near-duplicate lookup within the (platform, goal) bucket
+            lsh = self._lsh.get((new_pattern.platform, new_pattern.goal))
+            if lsh is None:
+                return None
+            candidates = lsh.query(self._minhash(new_text))
+            return min(candidates) if candidates else None
+
         for i, existing in enumerate(self.patterns):
             if (existing.platform == new_pattern.platform and
                 existing.goal == new_pattern.goal):
@@ -168,61 +307,255 @@ class VectorMemoryStore:
 
         return None
 
+    @staticmethod
+    def _minhash(text: str):
+        """MinHash signature of a pattern's word set"""
+        signature = MinHash(num_perm=64)
+        signature.update_batch([word.encode() for word in set(text.split())])
+        return signature
+
+    def _index_for_dedupe(self, idx: int) -> None:
+        """Add pattern idx to its bucket's LSH index"""
+        if MinHashLSH is None:
+            return
+
+        pattern = self.patterns[idx]
+        bucket = (pattern.platform, pattern.goal)
+        if bucket not in self._lsh:
+            self._lsh[bucket] = MinHashLSH(threshold=0.5, num_perm=64)
+        self._lsh[bucket].insert(idx, self._minhash(pattern.to_vector_text()))
+
+    def _rebuild_dedupe_index(self) -> None:
+        """Rebuild every LSH bucket from self.patterns"""
+        self._lsh = {}
+        for idx in range(len(self.patterns)):
+            self._index_for_dedupe(idx)
+
+    def _rebuild_columns(self) -> None:
+        """Rebuild the columnar scoring arrays from self.patterns"""
+        self._sr = np.array([p.success_rate for p in self.patterns], dtype=np.float32)
+        self._uc = np.array([p.usage_count for p in self.patterns], dtype=np.int32)
+        self._ts = np.array([int(p.timestamp.timestamp()) for p in self.patterns], dtype=np.int64)
+        self._et = np.array([p.avg_execution_time for p in self.patterns], dtype=np.float64)
+        self._platforms = np.array([p.platform for p in self.patterns], dtype=object)
+        self._goals = np.array([p.goal for p in self.patterns], dtype=object)
+
     def _rebuild_vectors(self) -> None:
         """Rebuild the vector representation of all patterns"""
         if not self.patterns:
             return
 
-        pattern_texts = [p.to_vector_text() for p in self.patterns]
-        self.pattern_vectors = self.vectorizer.fit_transform(pattern_texts)
+        self.pattern_vectors = self._vectorize([p.to_vector_text() for p in self.patterns])
+
+        bucket_rows = defaultdict(list)
+        for i, pattern in enumerate(self.patterns):
+            bucket_rows[(pattern.platform, pattern.goal)].append(i)
+        self._bucket_rows = {
+            bucket: np.array(rows, dtype=np.intp) for bucket, rows in bucket_rows.items()
+        }
+
+        self._recluster()
 
-        # Perform clustering to discover pattern families
+    def _recluster(self) -> None:
+        """Perform clustering to discover pattern families"""
+        self._dirty_count = 0
         if len(self.patterns) >= 10:
-            cluster_labels = self.clusterer.fit_predict(self.pattern_vectors.toarray())
+            # Mini-batch k-means works on the sparse matrix directly, no densifying
+            cluster_labels = self.clusterer.fit_predict(self.pattern_vectors)
             logger.info(f"Discovered {len(set(cluster_labels))} pattern clusters")
 
+    def _vectorize(self, texts: List[str]):
+        """Hash texts into L2-normalized rows at the store's precision"""
+        return self._quantize(self.vectorizer.transform(texts))
+
+    def _quantize(self, vectors):
+        """Convert L2-normalized float rows to the store's precision"""
+        if self.precision != 'int8':
+            return vectors
+
+        data = np.rint(vectors.data * self.INT8_SCALE).astype(np.int8)
+        return scipy.sparse.csr_matrix((data, vectors.indices, vectors.indptr), shape=vectors.shape)
+
+    def _append_vector(self, pattern: NavigationPattern) -> None:
+        """
+        Vectorize one new pattern and stack it onto the matrix
+
+        LEARNING CONCEPT: Incremental Indexing
+        Feature hashing has no vocabulary to refit, so inserts are O(L)
+        and never touch existing rows. Reclustering only happens once
+        enough new rows have accumulated.
+        """
+        if self.pattern_vectors is None:
+            self._rebuild_vectors()
+            return
+
+        row = self._vectorize([pattern.to_vector_text()])
+        self.pattern_vectors = scipy.sparse.vstack([self.pattern_vectors, row], format='csr')
+        self._dirty_count += 1
+
+        bucket = (pattern.platform, pattern.goal)
+        self._bucket_rows[bucket] = np.append(
+            self._bucket_rows.get(bucket, np.empty(0, dtype=np.intp)),
+            self.pattern_vectors.shape[0] - 1
+        )
+
+        if self._dirty_count > max(50, 0.1 * len(self.patterns)):
+            self._recluster()
+
     def get_platform_statistics(self) -> Dict[str, Dict]:
         """Get learning statistics by platform"""
-        platform_stats = defaultdict(lambda: {
-            'total_patterns': 0,
-            'avg_success_rate': 0.0,
-            'most_common_goals': Counter(),
-            'avg_execution_time': 0.0
-        })
-
-        for pattern in self.patterns:
-            stats = platform_stats[pattern.platform]
-            stats['total_patterns'] += 1
-            stats['avg_success_rate'] += pattern.success_rate
-            stats['most_common_goals'][pattern.goal] += 1
-            stats['avg_execution_time'] += pattern.avg_execution_time
-
-        # Calculate averages
-        for platform, stats in platform_stats.items():
-            count = stats['total_patterns']
-            stats['avg_success_rate'] /= count
-            stats['avg_execution_time'] /= count
-
-        return dict(platform_stats)
+        if not self.patterns:
+            return {}
+
+        # One grouped pass over the columnar arrays
+        platforms, platform_ids = np.unique(self._platforms.astype(str), return_inverse=True)
+        totals = np.bincount(platform_ids)
+        success_sums = np.bincount(platform_ids, weights=self._sr)
+        time_sums = np.bincount(platform_ids, weights=self._et)
+
+        # Goal counts per platform as a (platform x goal) count matrix
+        goals, goal_ids = np.unique(self._goals.astype(str), return_inverse=True)
+        goal_matrix = np.bincount(
+            platform_ids * len(goals) + goal_ids, minlength=len(platforms) * len(goals)
+        ).reshape(len(platforms), len(goals))
+
+        return {
+            str(platform): {
+                'total_patterns': int(totals[i]),
+                'avg_success_rate': float(success_sums[i] / totals[i]),
+                'most_common_goals': Counter({
+                    str(goals[j]): int(goal_matrix[i, j]) for j in np.flatnonzero(goal_matrix[i])
+                }),
+                'avg_execution_time': float(time_sums[i] / totals[i])
+            }
+            for i, platform in enumerate(platforms)
+        }
+
+    # Compact the append log into a fresh snapshot after this many records
+    SNAPSHOT_INTERVAL = 256
 
     def save_patterns(self) -> None:
-        """Persist patterns to disk"""
+        """Persist a full snapshot of the patterns and reset the append log"""
         patterns_file = self.memory_dir / "navigation_patterns.pkl"
-        with open(patterns_file, 'wb') as f:
+        tmp_file = patterns_file.with_suffix('.pkl.tmp')
+        with open(tmp_file, 'wb') as f:
             pickle.dump(self.patterns, f)
+        os.replace(tmp_file, patterns_file)
+
+        # Records are (index, full pattern) states, so replaying a log that
+        # outlived a crash here on top of the new snapshot is harmless
+        self._log.seek(0)
+        self._log.truncate()
+        self._log_records = 0
+
+    def close(self) -> None:
+        """
+        Close the append log and stop sharing this store
+
+        Writes reach the log unbuffered, so nothing is lost; the next
+        get_memory_store for this directory opens a fresh store.
+        """
+        with self._lock:
+            if self._log.closed:
+                return
+            self._log.close()
+
+        with _memory_stores_lock:
+            if _memory_stores.get(self.memory_dir.resolve()) is self:
+                del _memory_stores[self.memory_dir.resolve()]
+
+    def _append_to_log(self, idx: int, pattern: NavigationPattern) -> None:
+        """
+        Persist one pattern write as a length-prefixed log record
+
+        LEARNING CONCEPT: Write-Ahead Logging
+        Re-pickling every pattern on each insert is O(N) disk I/O; appending
+        the changed pattern is O(1), with periodic compaction to a snapshot.
+        """
+        record = pickle.dumps((idx, pattern))
+        self._log.write(struct.pack('<I', len(record)) + record)
+        self._log_records += 1
+
+        if self._log_records >= self.SNAPSHOT_INTERVAL:
+            self.save_patterns()
 
     def load_patterns(self) -> None:
-        """Load patterns from disk"""
+        """Load the pattern snapshot from disk, then replay the append log"""
         patterns_file = self.memory_dir / "navigation_patterns.pkl"
         if patterns_file.exists():
             try:
                 with open(patterns_file, 'rb') as f:
                     self.patterns = pickle.load(f)
-                logger.info(f"Loaded {len(self.patterns)} navigation patterns")
             except Exception as e:
                 logger.error(f"Failed to load patterns: {e}")
                 self.patterns = []
 
+        if self._log_path.exists():
+            try:
+                with open(self._log_path, 'rb') as f:
+                    while True:
+                        header = f.read(4)
+                        if len(header) < 4:
+                            break
+                        size = struct.unpack('<I', header)[0]
+                        record = f.read(size)
+                        if len(record) < size:
+                            break  # Torn final write
+                        idx, pattern = pickle.loads(record)
+                        if idx < len(self.patterns):
+                            self.patterns[idx] = pattern
+                        else:
+                            self.patterns.append(pattern)
+                        self._log_records += 1
+            except Exception as e:
+                logger.error(f"Failed to replay pattern log: {e}")
+
+        logger.info(f"Loaded {len(self.patterns)} navigation patterns")
+
+def _score_argmax(success_rates, usage_counts, timestamps, similarities, now):
+    """
+    Fused composite-score + argmax over candidate strategies
+
+    One pass, no temporary arrays. Returns (best position, best score).
+    """
+    best_i, best = -1, -1e30
+    for j in range(similarities.size):
+        # Recency decays over 30 days; usage caps at 10 uses
+        age_days = (now - timestamps[j]) // 86400
+        recency = 1.0 - age_days / 30
+        if recency < 0.1:
+            recency = 0.1
+        usage = usage_counts[j] / 10.0
+        if usage > 1.0:
+            usage = 1.0
+
+        score = (
+            0.4 * success_rates[j] +    # Success rate most important
+            0.3 * similarities[j] +     # Similarity to current context
+            0.2 * recency +             # How recent the pattern is
+            0.1 * usage                 # How well-tested it is
+        )
+        if score > best:
+            best, best_i = score, j
+    return best_i, best
+
+if njit is not None:
+    _score_argmax = njit(cache=True, fastmath=True)(_score_argmax)
+
+# One store per memory directory, shared by every agent in the process
+_memory_stores: "weakref.WeakValueDictionary[Path, VectorMemoryStore]" = weakref.WeakValueDictionary()
+_memory_stores_lock = threading.Lock()
+
+def get_memory_store(memory_dir: Path) -> VectorMemoryStore:
+    """Return the process-wide VectorMemoryStore for memory_dir, creating it once"""
+    memory_dir = memory_dir.resolve()
+    with _memory_stores_lock:
+        store = _memory_stores.get(memory_dir)
+        if store is None:
+            store = VectorMemoryStore(memory_dir)
+            _memory_stores[memory_dir] = store
+        return store
+
 # LEARNING CONCEPT 2: Adaptive Learning System
 # This system learns which strategies work best for different scenarios
 # and adapts its approach based on historical success
@@ -245,7 +578,11 @@ class AdaptiveLearningEngine:
     def _init_success_database(self) -> sqlite3.Connection:
         """Initialize SQLite database for tracking execution results"""
         db_path = self.memory_store.memory_dir / "learning_results.db"
-        conn = sqlite3.connect(str(db_path))
+        # Statements are prepared once and reused from the connection's cache
+        conn = sqlite3.connect(str(db_path), cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
 
         conn.execute("""
             CREATE TABLE IF NOT EXISTS execution_results (
@@ -273,6 +610,21 @@ class AdaptiveLearningEngine:
             )
         """)
 
+        # Covering indexes: the daily stats GROUP BY and trend halves read only
+        # (timestamp, success); top strategies come back in index order
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_exec_ts ON execution_results(timestamp, success)")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS ix_perf_rate
+            ON strategy_performance(success_rate DESC, total_attempts DESC)
+        """)
+
+        # Give the query planner statistics once there's enough history to matter
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stats and conn.execute("SELECT COUNT(*) FROM execution_results").fetchone()[0] >= 1000:
+            conn.execute("ANALYZE")
+
         conn.commit()
         return conn
 
@@ -284,79 +636,84 @@ class AdaptiveLearningEngine:
                               execution_time: float,
                               context: LearningContext) -> None:
         """Record the result of a navigation attempt for learning"""
+        self.record_execution_results_bulk([
+            (platform, goal, navigation_steps, success, execution_time, context)
+        ])
 
-        # Create a hash of the strategy used
-        strategy_text = json.dumps(navigation_steps, sort_keys=True)
-        strategy_hash = hashlib.md5(strategy_text.encode()).hexdigest()
-
-        # Record individual execution
-        self.success_db.execute("""
-            INSERT INTO execution_results
-            (platform, goal, strategy_hash, success, execution_time, error_type, timestamp, page_url, confidence_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            platform, goal, strategy_hash, success, execution_time,
-            context.error_message, datetime.now(), context.url_pattern, 0.8
-        ))
-
-        # Update strategy performance
-        self._update_strategy_performance(strategy_hash, success, execution_time)
-
-        # If successful, add to pattern memory
-        if success:
-            pattern = NavigationPattern(
-                platform=platform,
-                goal=goal,
-                page_context=context.url_pattern,
-                successful_steps=navigation_steps,
-                success_rate=self._calculate_strategy_success_rate(strategy_hash),
-                confidence_score=0.8,
-                timestamp=datetime.now(),
-                usage_count=1,
-                avg_execution_time=execution_time
-            )
-            self.memory_store.add_pattern(pattern)
+    def record_execution_results_bulk(self,
+                                      results: List[Tuple[str, str, List[Dict], bool, float, LearningContext]]) -> None:
+        """
+        Record many navigation attempts in a single transaction
 
-        self.success_db.commit()
+        Each entry is (platform, goal, navigation_steps, success,
+        execution_time, context), as for record_execution_result. Useful
+        when replaying historical results on import.
+        """
+        if not results:
+            return
 
-    def _update_strategy_performance(self, strategy_hash: str, success: bool, execution_time: float) -> None:
-        """Update the performance metrics for a strategy"""
-        cursor = self.success_db.execute(
-            "SELECT total_attempts, successful_attempts, avg_execution_time FROM strategy_performance WHERE strategy_hash = ?",
-            (strategy_hash,)
-        )
-        result = cursor.fetchone()
-
-        if result:
-            total, successful, avg_time = result
-            new_total = total + 1
-            new_successful = successful + (1 if success else 0)
-            new_avg_time = (avg_time * total + execution_time) / new_total
-            success_rate = new_successful / new_total
-
-            self.success_db.execute("""
-                UPDATE strategy_performance
-                SET total_attempts = ?, successful_attempts = ?, avg_execution_time = ?,
-                    success_rate = ?, last_updated = ?
-                WHERE strategy_hash = ?
-            """, (new_total, new_successful, new_avg_time, success_rate, datetime.now(), strategy_hash))
-        else:
-            # First time seeing this strategy
-            success_rate = 1.0 if success else 0.0
-            self.success_db.execute("""
-                INSERT INTO strategy_performance
-                (strategy_hash, total_attempts, successful_attempts, avg_execution_time, success_rate, last_updated)
-                VALUES (?, 1, ?, ?, ?, ?)
-            """, (strategy_hash, 1 if success else 0, execution_time, success_rate, datetime.now()))
-
-    def _calculate_strategy_success_rate(self, strategy_hash: str) -> float:
-        """Calculate current success rate for a strategy"""
-        cursor = self.success_db.execute(
-            "SELECT success_rate FROM strategy_performance WHERE strategy_hash = ?",
-            (strategy_hash,)
-        )
-        result = cursor.fetchone()
-        return result[0] if result else 0.0
+        # Create a hash of each strategy used
+        strategy_hashes = [self._hash_strategy(steps) for _, _, steps, _, _, _ in results]
+        now = datetime.now()
+
+        # Record the executions and their strategy stats in one transaction
+        with self.success_db:
+            self.success_db.executemany("""
+                INSERT INTO execution_results
+                (platform, goal, strategy_hash, success, execution_time, error_type, timestamp, page_url, confidence_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (platform, goal, strategy_hash, success, execution_time,
+                 context.error_message, now, context.url_pattern, 0.8)
+                for (platform, goal, _, success, execution_time, context), strategy_hash
+                in zip(results, strategy_hashes)
+            ])
+
+            for (platform, goal, navigation_steps, success, execution_time, context), strategy_hash \
+                    in zip(results, strategy_hashes):
+                # Update strategy performance
+                success_rate = self._update_strategy_performance(strategy_hash, success, execution_time)
+
+                # If successful, add to pattern memory
+                if success:
+                    pattern = NavigationPattern(
+                        platform=platform,
+                        goal=goal,
+                        page_context=context.url_pattern,
+                        successful_steps=navigation_steps,
+                        success_rate=success_rate,
+                        confidence_score=0.8,
+                        timestamp=now,
+                        usage_count=1,
+                        avg_execution_time=execution_time
+                    )
+                    self.memory_store.add_pattern(pattern)
+
+    @staticmethod
+    def _hash_strategy(navigation_steps: List[Dict]) -> str:
+        """Stable fingerprint of a step list (canonical, key-sorted JSON)"""
+        if orjson is not None:
+            return xxhash.xxh3_128_hexdigest(orjson.dumps(navigation_steps, option=orjson.OPT_SORT_KEYS))
+
+        strategy_text = json.dumps(navigation_steps, sort_keys=True)
+        return hashlib.md5(strategy_text.encode()).hexdigest()
+
+    def _update_strategy_performance(self, strategy_hash: str, success: bool, execution_time: float) -> float:
+        """Update the performance metrics for a strategy, returning its new success rate"""
+        # Single read-modify-write: SET expressions see the pre-update row
+        cursor = self.success_db.execute("""
+            INSERT INTO strategy_performance
+            (strategy_hash, total_attempts, successful_attempts, avg_execution_time, success_rate, last_updated)
+            VALUES (?, 1, ?, ?, ?, ?)
+            ON CONFLICT(strategy_hash) DO UPDATE SET
+                total_attempts = total_attempts + 1,
+                successful_attempts = successful_attempts + excluded.successful_attempts,
+                avg_execution_time = (avg_execution_time * total_attempts + excluded.avg_execution_time) / (total_attempts + 1),
+                success_rate = CAST(successful_attempts + excluded.successful_attempts AS REAL) / (total_attempts + 1),
+                last_updated = excluded.last_updated
+            RETURNING success_rate
+        """, (strategy_hash, 1 if success else 0, execution_time, 1.0 if success else 0.0, datetime.now()))
+        return cursor.fetchone()[0]
 
     def get_optimal_strategy(self, platform: str, goal: str, context: str) -> Optional[NavigationPattern]:
         """
@@ -369,43 +726,26 @@ class AdaptiveLearningEngine:
         """
 
         # Get similar patterns from vector memory
-        similar_patterns = self.memory_store.find_similar_patterns(
+        store = self.memory_store
+        indices, similarities = store.find_similar_indices(
             context=context,
             platform=platform,
             goal=goal,
             top_k=10
         )
 
-        if not similar_patterns:
+        if indices.size == 0:
             return None
 
-        # Score patterns based on multiple factors
-        scored_patterns = []
-        for pattern, similarity in similar_patterns:
-            # Calculate recency bonus (more recent = better)
-            days_old = (datetime.now() - pattern.timestamp).days
-            recency_score = max(0.1, 1.0 - (days_old / 30))  # Decay over 30 days
-
-            # Calculate usage bonus (more used = more reliable)
-            usage_score = min(1.0, pattern.usage_count / 10)  # Cap at 10 uses
-
-            # Combine factors
-            composite_score = (
-                pattern.success_rate * 0.4 +      # Success rate most important
-                similarity * 0.3 +                # Similarity to current context
-                recency_score * 0.2 +            # How recent the pattern is
-                usage_score * 0.1                # How well-tested it is
-            )
-
-            scored_patterns.append((pattern, composite_score))
+        # Score patterns based on multiple factors, over the columnar arrays
+        best, score = _score_argmax(
+            store._sr[indices], store._uc[indices], store._ts[indices],
+            similarities, int(datetime.now().timestamp())
+        )
 
         # Return the best scoring pattern
-        if scored_patterns:
-            best_pattern, score = max(scored_patterns, key=lambda x: x[1])
-            logger.info(f"Selected strategy with score {score:.3f} for {platform}/{goal}")
-            return best_pattern
-
-        return None
+        logger.info(f"Selected strategy with score {score:.3f} for {platform}/{goal}")
+        return store.patterns[indices[best]]
 
     def generate_learning_report(self) -> Dict[str, Any]:
         """Generate a comprehensive learning report"""
@@ -452,24 +792,23 @@ class AdaptiveLearningEngine:
 
     def _calculate_improvement_trend(self) -> float:
         """Calculate if success rates are improving over time"""
-        cursor = self.success_db.execute("""
-            SELECT timestamp, success
-            FROM execution_results
-            ORDER BY timestamp
-        """)
-        results = cursor.fetchall()
-
-        if len(results) < 10:
+        # Compare recent performance to earlier performance; both halves are
+        # aggregated in SQL via the (timestamp, success) index
+        total, early_success_rate, recent_success_rate = self.success_db.execute("""
+            WITH n AS (SELECT COUNT(*) AS c FROM execution_results)
+            SELECT
+                (SELECT c FROM n),
+                (SELECT AVG(CAST(success AS REAL)) FROM (
+                    SELECT success FROM execution_results
+                    ORDER BY timestamp LIMIT (SELECT c / 2 FROM n))),
+                (SELECT AVG(CAST(success AS REAL)) FROM (
+                    SELECT success FROM execution_results
+                    ORDER BY timestamp DESC LIMIT (SELECT c - c / 2 FROM n)))
+        """).fetchone()
+
+        if total < 10:
             return 0.0
 
-        # Compare recent performance to earlier performance
-        midpoint = len(results) // 2
-        early_results = results[:midpoint]
-        recent_results = results[midpoint:]
-
-        early_success_rate = sum(1 for _, success in early_results if success) / len(early_results)
-        recent_success_rate = sum(1 for _, success in recent_results if success) / len(recent_results)
-
         return recent_success_rate - early_success_rate  # Positive = improving
 
 # LEARNING CONCEPT 3: Integration with Agent Architecture
@@ -492,7 +831,7 @@ class LearningAwareAgent:
         if memory_dir is None:
             memory_dir = Path.home() / ".academic_assistant" / "agent_memory"
 
-        self.memory_store = VectorMemoryStore(memory_dir)
+        self.memory_store = get_memory_store(memory_dir)
         self.learning_engine = AdaptiveLearningEngine(self.memory_store)
 
     async def navigate_with_learning(self, goal: str, context: str) -> bool:
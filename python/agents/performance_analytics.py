@@ -4,19 +4,82 @@ Academic Performance Analytics & Health Tracking
 Teaching concepts: Time Series Analytics, Trend Detection, Anomaly Detection, Data Visualization
 """
 
+import sys
 import json
 import sqlite3
+import functools
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field, asdict
+from contextlib import contextmanager
+from operator import attrgetter
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
+import time
 import logging
 from collections import defaultdict, Counter
-import statistics
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+
+# Optional: columnar cold storage for old outcomes
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
+
+# Optional: vectorized columnar engine for scanning the archive
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Optional JIT for the stress-score kernel (it runs as plain Python without it)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# DATETIME columns are stored as ISO-8601 text (with or without microseconds)
+_OUTCOME_DATE_COLUMNS = {
+    'submitted_date': {'format': 'ISO8601'},
+    'due_date': {'format': 'ISO8601'},
+}
+
+# Time-of-day bucket for each hour: night < 5, morning < 12, afternoon < 17,
+# evening < 22, then night again
+_TIME_OF_DAY = (
+    ('night',) * 5 + ('morning',) * 7 + ('afternoon',) * 5 + ('evening',) * 5 + ('night',) * 2
+)
+
+# Hot statements as constants: identical SQL strings hit the connection's
+# prepared-statement cache instead of being re-parsed on every call
+_INSERT_OUTCOME_SQL = """
+    INSERT OR REPLACE INTO assignment_outcomes
+    (assignment_id, title, course, assignment_type, assigned_date, due_date,
+     submitted_date, grade, points_possible, difficulty, estimated_hours, actual_hours)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_SESSION_SQL = """
+    INSERT INTO study_sessions
+    (session_id, assignment_id, course, start_time, end_time, duration_minutes,
+     tasks_completed, productivity_score, focus_quality, location, time_of_day)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_RECENT_SQL = """
+    SELECT submitted_date, due_date, percentage, grade,
+           submitted_date IS NOT NULL AS completed
+    FROM assignment_outcomes
+    WHERE submitted_date >= ?
+    ORDER BY submitted_date DESC
+"""
+
 # LEARNING CONCEPT 1: Academic Health Scoring
 # Multi-dimensional assessment of student wellbeing and performance
 
@@ -34,7 +97,7 @@ class StressLevel(Enum):
     HIGH = "high"
     OVERWHELMING = "overwhelming"
 
-@dataclass
+@dataclass(slots=True)
 class AcademicHealthMetrics:
     """
     Comprehensive academic health assessment
@@ -72,15 +135,25 @@ class AcademicHealthMetrics:
     confidence_score: float
     generated_at: datetime = field(default_factory=datetime.now)
 
+    # Fields that serialize as-is; the enums and timestamp are converted below
+    _PLAIN_FIELDS = (
+        'assignment_completion_rate', 'on_time_submission_rate', 'average_grade',
+        'grade_trend', 'workload_trend', 'productivity_trend',
+        'upcoming_deadline_count', 'overdue_assignments', 'consecutive_late_submissions',
+        'days_since_last_completion', 'streak_days', 'ahead_of_schedule_count',
+        'data_points_analyzed', 'confidence_score'
+    )
+    _get_plain_fields = attrgetter(*_PLAIN_FIELDS)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization"""
-        result = asdict(self)
+        """Convert to dictionary for serialization (flat fields, no asdict deep copy)"""
+        result = dict(zip(self._PLAIN_FIELDS, self._get_plain_fields(self)))
         result['overall_status'] = self.overall_status.value
         result['current_stress_level'] = self.current_stress_level.value
         result['generated_at'] = self.generated_at.isoformat()
         return result
 
-@dataclass
+@dataclass(slots=True)
 class SubmissionPattern:
     """
     Analysis of submission timing patterns
@@ -108,7 +181,7 @@ class SubmissionPattern:
     early_submission_avg_grade: Optional[float] = None
     late_submission_avg_grade: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class ProductivityPattern:
     """
     Analysis of productivity patterns
@@ -130,7 +203,7 @@ class ProductivityPattern:
     tasks_completed_per_hour: float
     distraction_rate: float  # 0-1
 
-@dataclass
+@dataclass(slots=True)
 class GradeTrend:
     """
     Grade progression analysis
@@ -171,11 +244,24 @@ class PerformanceDatabase:
         self.storage_dir = storage_dir
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.db = self._init_database()
+        # Bumped on every write so readers can tell when cached results are stale
+        self.version = 0
 
     def _init_database(self) -> sqlite3.Connection:
         """Initialize performance tracking database"""
         db_path = self.storage_dir / "performance_analytics.db"
-        conn = sqlite3.connect(str(db_path))
+        # Autocommit mode: writes group themselves with explicit BEGIN IMMEDIATE
+        conn = sqlite3.connect(str(db_path), isolation_level=None, cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        # Single-process analytics store: WAL + relaxed fsync, big page cache,
+        # in-memory temp tables and mmap'd reads
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        # INSERT OR REPLACE must fire delete triggers so rollups stay exact
+        conn.execute("PRAGMA recursive_triggers = ON")
 
         # Assignment outcomes table
         conn.execute("""
@@ -190,12 +276,16 @@ class PerformanceDatabase:
                 assigned_date DATETIME,
                 due_date DATETIME NOT NULL,
                 submitted_date DATETIME,
-                days_before_deadline REAL,
+                days_before_deadline REAL GENERATED ALWAYS AS (
+                    julianday(due_date) - julianday(submitted_date)
+                ) STORED,
 
                 -- Performance
                 grade REAL,
                 points_possible REAL,
-                percentage REAL,
+                percentage REAL GENERATED ALWAYS AS (
+                    CASE WHEN points_possible > 0 THEN grade * 100.0 / points_possible END
+                ) STORED,
 
                 -- Metadata
                 difficulty TEXT,
@@ -203,15 +293,33 @@ class PerformanceDatabase:
                 actual_hours REAL,
 
                 -- Timestamps
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-
-                -- Indexes
-                INDEX idx_course (course),
-                INDEX idx_due_date (due_date),
-                INDEX idx_submitted_date (submitted_date)
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
+        # Partial indexes matching the hot queries: submission-centric reads,
+        # per-course grade history, and the open/overdue aggregate
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outcomes_sub
+            ON assignment_outcomes(submitted_date DESC)
+            WHERE submitted_date IS NOT NULL
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outcomes_course_sub
+            ON assignment_outcomes(course, submitted_date)
+            WHERE percentage IS NOT NULL
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outcomes_due_open
+            ON assignment_outcomes(due_date)
+            WHERE submitted_date IS NULL
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outcomes_percentage
+            ON assignment_outcomes(percentage)
+            WHERE percentage IS NOT NULL
+        """)
+
         # Study sessions table
         conn.execute("""
             CREATE TABLE IF NOT EXISTS study_sessions (
@@ -234,12 +342,11 @@ class PerformanceDatabase:
                 location TEXT,
                 time_of_day TEXT,  -- morning, afternoon, evening, night
 
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-
-                INDEX idx_start_time (start_time),
-                INDEX idx_course (course)
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_start ON study_sessions(start_time)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_course ON study_sessions(course)")
 
         # Stress indicators table
         conn.execute("""
@@ -255,11 +362,10 @@ class PerformanceDatabase:
                 stress_score REAL,  -- 0-1
                 stress_level TEXT,
 
-                recorded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-
-                INDEX idx_recorded_at (recorded_at)
+                recorded_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_stress_recorded ON stress_indicators(recorded_at)")
 
         # Daily summary table (for efficient querying)
         conn.execute("""
@@ -269,132 +375,376 @@ class PerformanceDatabase:
                 assignments_completed INTEGER DEFAULT 0,
                 assignments_started INTEGER DEFAULT 0,
                 study_minutes INTEGER DEFAULT 0,
+                session_count INTEGER DEFAULT 0,
                 average_productivity REAL,
 
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
-        conn.commit()
+        # Keep daily_summaries incrementally up to date (a materialized rollup)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_summary_outcome_insert
+            AFTER INSERT ON assignment_outcomes
+            WHEN NEW.submitted_date IS NOT NULL
+            BEGIN
+                INSERT INTO daily_summaries (date, assignments_completed)
+                VALUES (date(NEW.submitted_date), 1)
+                ON CONFLICT(date) DO UPDATE SET
+                    assignments_completed = assignments_completed + 1;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_summary_outcome_delete
+            AFTER DELETE ON assignment_outcomes
+            WHEN OLD.submitted_date IS NOT NULL
+            BEGIN
+                UPDATE daily_summaries
+                SET assignments_completed = assignments_completed - 1
+                WHERE date = date(OLD.submitted_date);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_summary_session_insert
+            AFTER INSERT ON study_sessions
+            BEGIN
+                INSERT INTO daily_summaries (date, study_minutes, session_count, average_productivity)
+                VALUES (date(NEW.start_time), NEW.duration_minutes, 1, NEW.productivity_score)
+                ON CONFLICT(date) DO UPDATE SET
+                    study_minutes = study_minutes + excluded.study_minutes,
+                    average_productivity = (
+                        COALESCE(average_productivity, 0) * session_count + excluded.average_productivity
+                    ) / (session_count + 1),
+                    session_count = session_count + 1;
+            END
+        """)
+
         return conn
 
-    def record_assignment_outcome(self, outcome: Dict[str, Any]):
-        """Record assignment completion outcome"""
+    @contextmanager
+    def _transaction(self):
+        """Group writes into one transaction, taking the write lock up front"""
+        self.db.execute("BEGIN IMMEDIATE")
         try:
-            # Calculate derived fields
-            days_before = None
-            if outcome.get('submitted_date') and outcome.get('due_date'):
-                delta = outcome['due_date'] - outcome['submitted_date']
-                days_before = delta.total_seconds() / (24 * 3600)
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
 
-            percentage = None
-            if outcome.get('grade') and outcome.get('points_possible'):
-                percentage = (outcome['grade'] / outcome['points_possible']) * 100
+    def record_assignment_outcome(self, outcome: Dict[str, Any]):
+        """Record assignment completion outcome"""
+        self.record_assignment_outcomes_bulk([outcome])
 
-            self.db.execute("""
-                INSERT OR REPLACE INTO assignment_outcomes
-                (assignment_id, title, course, assignment_type, assigned_date, due_date,
-                 submitted_date, days_before_deadline, grade, points_possible, percentage,
-                 difficulty, estimated_hours, actual_hours)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                outcome.get('assignment_id'),
-                outcome.get('title'),
-                outcome.get('course'),
-                outcome.get('assignment_type'),
-                outcome.get('assigned_date'),
-                outcome.get('due_date'),
-                outcome.get('submitted_date'),
-                days_before,
-                outcome.get('grade'),
-                outcome.get('points_possible'),
-                percentage,
-                outcome.get('difficulty'),
-                outcome.get('estimated_hours'),
-                outcome.get('actual_hours')
-            ))
-            self.db.commit()
+    def record_assignment_outcomes_bulk(self, outcomes: List[Dict[str, Any]]):
+        """Record many assignment outcomes in a single transaction"""
+        try:
+            with self._transaction():
+                self.db.executemany(
+                    _INSERT_OUTCOME_SQL, [self._outcome_row(outcome) for outcome in outcomes]
+                )
+            self.version += 1
 
         except Exception as e:
-            logger.error(f"Failed to record assignment outcome: {e}")
+            logger.error(f"Failed to record assignment outcomes: {e}")
+
+    @staticmethod
+    def _outcome_row(outcome: Dict[str, Any]) -> Tuple:
+        """Build the assignment_outcomes parameter tuple (derived columns are GENERATED)"""
+        return (
+            outcome.get('assignment_id'),
+            outcome.get('title'),
+            outcome.get('course'),
+            outcome.get('assignment_type'),
+            outcome.get('assigned_date'),
+            outcome.get('due_date'),
+            outcome.get('submitted_date'),
+            outcome.get('grade'),
+            outcome.get('points_possible'),
+            outcome.get('difficulty'),
+            outcome.get('estimated_hours'),
+            outcome.get('actual_hours')
+        )
 
     def record_study_session(self, session: Dict[str, Any]):
         """Record study session"""
-        try:
-            start = session['start_time']
-            end = session['end_time']
-            duration_minutes = (end - start).total_seconds() / 60
-
-            # Determine time of day
-            hour = start.hour
-            if 5 <= hour < 12:
-                time_of_day = "morning"
-            elif 12 <= hour < 17:
-                time_of_day = "afternoon"
-            elif 17 <= hour < 22:
-                time_of_day = "evening"
-            else:
-                time_of_day = "night"
+        self.record_study_sessions_bulk([session])
 
-            self.db.execute("""
-                INSERT INTO study_sessions
-                (session_id, assignment_id, course, start_time, end_time, duration_minutes,
-                 tasks_completed, productivity_score, focus_quality, location, time_of_day)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                session.get('session_id'),
-                session.get('assignment_id'),
-                session.get('course'),
-                start,
-                end,
-                duration_minutes,
-                session.get('tasks_completed', 0),
-                session.get('productivity_score', 0.5),
-                session.get('focus_quality', 0.5),
-                session.get('location'),
-                time_of_day
-            ))
-            self.db.commit()
+    def record_study_sessions_bulk(self, sessions: List[Dict[str, Any]]):
+        """Record many study sessions in a single transaction"""
+        try:
+            with self._transaction():
+                self.db.executemany(
+                    _INSERT_SESSION_SQL, [self._session_row(session) for session in sessions]
+                )
+            self.version += 1
 
         except Exception as e:
-            logger.error(f"Failed to record study session: {e}")
+            logger.error(f"Failed to record study sessions: {e}")
+
+    @staticmethod
+    def _session_row(session: Dict[str, Any]) -> Tuple:
+        """Build the study_sessions parameter tuple"""
+        start = session['start_time']
+        end = session['end_time']
+
+        return (
+            session.get('session_id'),
+            session.get('assignment_id'),
+            session.get('course'),
+            start,
+            end,
+            (end - start).total_seconds() / 60,
+            session.get('tasks_completed', 0),
+            session.get('productivity_score', 0.5),
+            session.get('focus_quality', 0.5),
+            session.get('location'),
+            _TIME_OF_DAY[start.hour]
+        )
 
-    def get_recent_outcomes(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Get assignment outcomes from last N days"""
+    def get_recent_outcomes(self, days: int = 30) -> pd.DataFrame:
+        """
+        Get assignment outcomes from last N days
+
+        LEARNING CONCEPT: Columnar fetch
+        One DataFrame column per field lets analyzers use vectorized
+        operations instead of looping over per-row Python dicts.
+        """
         cutoff = datetime.now() - timedelta(days=days)
 
-        cursor = self.db.execute("""
-            SELECT *
+        return pd.read_sql_query(
+            _SELECT_RECENT_SQL, self.db, params=(cutoff,), parse_dates=_OUTCOME_DATE_COLUMNS
+        )
+
+    def get_health_aggregates(self, days: int = 30) -> sqlite3.Row:
+        """
+        Compute the scalar health metrics for the last N days in one query
+
+        LEARNING CONCEPT: Push aggregation into the database
+        Conditional aggregates let SQLite produce every rate and count in a
+        single scan, without materializing rows in Python. Covers outcomes
+        submitted in the window plus unsubmitted ones that fell due in it;
+        work that is not due yet has not been missed, so it is left out.
+        """
+        now = datetime.now()
+        cutoff = now - timedelta(days=days)
+
+        return self.db.execute("""
+            SELECT
+                COUNT(*) AS n,
+                AVG(CASE WHEN submitted_date IS NOT NULL THEN 1.0 ELSE 0.0 END) AS completion_rate,
+                AVG(CASE WHEN submitted_date <= due_date THEN 1.0 ELSE 0.0 END)
+                    FILTER (WHERE submitted_date IS NOT NULL) AS on_time_rate,
+                AVG(percentage) AS avg_grade,
+                SUM(CASE WHEN submitted_date IS NULL AND due_date < :now THEN 1 ELSE 0 END) AS overdue,
+                MAX(submitted_date) AS last_submission,
+                SUM(CASE WHEN julianday(due_date) - julianday(submitted_date) > 1 THEN 1 ELSE 0 END) AS early
             FROM assignment_outcomes
-            WHERE submitted_date >= ?
-            ORDER BY submitted_date DESC
-        """, (cutoff,))
+            WHERE submitted_date >= :cutoff
+            OR (submitted_date IS NULL AND due_date >= :cutoff AND due_date < :now)
+        """, {'now': now, 'cutoff': cutoff}).fetchone()
+
+    def get_daily_summaries(self, days: int = 30) -> List[sqlite3.Row]:
+        """Get per-day activity rollups for the last N days, newest first"""
+        cutoff = (datetime.now() - timedelta(days=days)).date()
+
+        return self.db.execute("""
+            SELECT date, assignments_completed, study_minutes, average_productivity
+            FROM daily_summaries
+            WHERE date >= ?
+            ORDER BY date DESC
+        """, (cutoff.isoformat(),)).fetchall()
+
+    def refresh_daily_summaries(self):
+        """Rebuild daily_summaries from scratch (triggers keep it current afterwards)"""
+        with self._transaction():
+            self.db.execute("DELETE FROM daily_summaries")
+            self.db.execute("""
+                WITH activity AS (
+                    SELECT date(submitted_date) AS date, 1 AS completed, 0 AS minutes,
+                           0 AS sessions, NULL AS productivity
+                    FROM assignment_outcomes
+                    WHERE submitted_date IS NOT NULL
+                    UNION ALL
+                    SELECT date(start_time), 0, duration_minutes, 1, productivity_score
+                    FROM study_sessions
+                )
+                INSERT INTO daily_summaries
+                (date, assignments_completed, study_minutes, session_count, average_productivity)
+                SELECT date, SUM(completed), SUM(minutes), SUM(sessions), AVG(productivity)
+                FROM activity
+                GROUP BY date
+            """)
 
-        return [dict(row) for row in cursor.fetchall()]
+    def archive_old_outcomes(self, older_than_days: int = 60) -> int:
+        """
+        Move old submitted outcomes into a Parquet archive partitioned by month
 
-    def get_grade_history(self, course: Optional[str] = None) -> List[Tuple[datetime, float]]:
-        """Get grade history over time"""
+        LEARNING CONCEPT: Hot/cold storage
+        Recent rows stay in SQLite for point lookups and upserts; full-term
+        history is scanned column-wise from Parquet, where row-group statistics
+        and partition pruning skip irrelevant data.
+
+        Note: deleting archived rows also decrements daily_summaries, so the
+        rollup only covers outcomes still in SQLite.
+        """
+        if pq is None:
+            logger.warning("pyarrow not installed; skipping outcome archive")
+            return 0
+
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        old = pd.read_sql_query(
+            "SELECT * FROM assignment_outcomes WHERE submitted_date < ?",
+            self.db, params=(cutoff,)
+        )
+        if old.empty:
+            return 0
+
+        old['year_month'] = old['submitted_date'].str[:7]
+        pq.write_to_dataset(
+            pa.Table.from_pandas(old, preserve_index=False),
+            root_path=str(self.archive_dir),
+            partition_cols=['course', 'year_month'],
+            partitioning_flavor='hive',
+            basename_template=f"part-{int(time.time())}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            compression='zstd'
+        )
+
+        with self._transaction():
+            self.db.execute(
+                "DELETE FROM assignment_outcomes WHERE submitted_date < ?", (cutoff,)
+            )
+        self.version += 1
+
+        logger.info(f"Archived {len(old)} outcomes older than {older_than_days} days")
+        return len(old)
+
+    @property
+    def archive_dir(self) -> Path:
+        return self.storage_dir / "archive"
+
+    def _archived_grade_history(self, course: Optional[str]) -> List[Tuple[str, float]]:
+        """
+        Read (submitted_date, percentage) pairs from the Parquet archive
+
+        LEARNING CONCEPT: Columnar scan engines
+        DuckDB (when installed) scans the Parquet files with a vectorized,
+        multi-threaded engine and prunes hive partitions from the course
+        filter; pyarrow datasets are the fallback.
+        """
+        if not self.archive_dir.exists():
+            return []
+
+        if duckdb is not None:
+            return self._archived_grade_history_duckdb(course)
+        if ds is None:
+            return []
+
+        partitioning = ds.partitioning(
+            pa.schema([('course', pa.string()), ('year_month', pa.string())]),
+            flavor='hive'
+        )
+        dataset = ds.dataset(str(self.archive_dir), format='parquet', partitioning=partitioning)
+
+        condition = ds.field('percentage').is_valid()
         if course:
-            cursor = self.db.execute("""
-                SELECT submitted_date, percentage
-                FROM assignment_outcomes
-                WHERE course = ?
-                AND percentage IS NOT NULL
-                ORDER BY submitted_date
-            """, (course,))
+            condition &= ds.field('course') == course
+
+        table = dataset.to_table(columns=['submitted_date', 'percentage'], filter=condition)
+        return list(zip(table.column('submitted_date').to_pylist(),
+                        table.column('percentage').to_pylist()))
+
+    def _archived_grade_history_duckdb(self, course: Optional[str]) -> List[Tuple[str, float]]:
+        """DuckDB scan of the archive (projection + partition pruning)"""
+        files = str(self.archive_dir / "**" / "*.parquet").replace("'", "''")
+        sql = f"""
+            SELECT submitted_date, percentage
+            FROM read_parquet('{files}', hive_partitioning = true,
+                              hive_types = {{'course': VARCHAR, 'year_month': VARCHAR}})
+            WHERE percentage IS NOT NULL
+        """
+        params: List[Any] = []
+        if course:
+            sql += " AND course = ?"
+            params.append(course)
+
+        with duckdb.connect() as con:
+            return con.execute(sql, params).fetchall()
+
+    def get_grade_history(self,
+                          course: Optional[str] = None,
+                          limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get grade history over time as parallel (datetime64[us], float64) arrays
+
+        Rows are streamed from the cursor straight into preallocated arrays,
+        so the result set is never materialized as Python tuples. With a
+        limit, only the most recent submissions are read (newest-first scan
+        of the submission index, reversed in memory).
+        """
+        where = "WHERE percentage IS NOT NULL"
+        params: Tuple = ()
+        if course:
+            where += " AND course = ?"
+            params = (course,)
+
+        if limit is None:
+            n = self.db.execute(f"SELECT COUNT(*) FROM assignment_outcomes {where}", params).fetchone()[0]
+            order = "ORDER BY submitted_date"
         else:
-            cursor = self.db.execute("""
-                SELECT submitted_date, percentage
-                FROM assignment_outcomes
-                WHERE percentage IS NOT NULL
-                ORDER BY submitted_date
-            """)
+            n = limit
+            where += " AND submitted_date IS NOT NULL"
+            order = "ORDER BY submitted_date DESC LIMIT ?"
+            params += (limit,)
 
-        return [(row[0], row[1]) for row in cursor.fetchall()]
+        dates = np.empty(n, dtype='datetime64[us]')
+        grades = np.empty(n, dtype=np.float64)
+
+        cursor = self.db.execute(f"""
+            SELECT submitted_date, percentage
+            FROM assignment_outcomes
+            {where}
+            {order}
+        """, params)
+        count = 0
+        for submitted, percentage in cursor:
+            if count == n:
+                break
+            dates[count] = np.datetime64(submitted, 'us')
+            grades[count] = percentage
+            count += 1
+        dates, grades = dates[:count], grades[:count]
+        if limit is not None:
+            dates, grades = dates[::-1], grades[::-1]
+            if count == limit:
+                return dates, grades  # Archived rows are all older
+
+        archived = self._archived_grade_history(course)
+        if archived:
+            archived_dates = np.array([d for d, _ in archived], dtype='datetime64[us]')
+            archived_grades = np.fromiter((g for _, g in archived), dtype=np.float64, count=len(archived))
+            dates = np.concatenate((archived_dates, dates))
+            grades = np.concatenate((archived_grades, grades))
+            order = np.argsort(dates, kind='stable')
+            dates, grades = dates[order], grades[order]
+            if limit is not None:
+                dates, grades = dates[-limit:], grades[-limit:]
+
+        return dates, grades
 
 # LEARNING CONCEPT 3: Statistical Analysis for Trend Detection
 # Identify patterns and trends in performance data
 
+def _stress_score(upcoming: int, hours: float, days: float) -> float:
+    """Workload stress score in [0, 1]: 40% assignment density, 60% hours/day"""
+    days = max(days, 1.0)
+    # More than 2 assignments/day or 8 hours/day = high stress
+    return min(1.0, upcoming / days / 2.0) * 0.4 + min(1.0, hours / days / 8.0) * 0.6
+
+if njit is not None:
+    _stress_score = njit(cache=True)(_stress_score)
+
 class PerformanceTrendAnalyzer:
     """
     Statistical analysis of performance trends
@@ -407,73 +757,38 @@ class PerformanceTrendAnalyzer:
     """
 
     @staticmethod
-    def calculate_completion_rate(outcomes: List[Dict]) -> float:
+    def calculate_completion_rate(outcomes: pd.DataFrame) -> float:
         """
         Calculate assignment completion rate
 
         LEARNING CONCEPT: Simple but essential metric
         """
-        if not outcomes:
+        if outcomes.empty:
             return 1.0  # No data = assume good
 
-        completed = sum(1 for o in outcomes if o.get('submitted_date'))
-        return completed / len(outcomes)
+        return float(outcomes['completed'].mean())
 
     @staticmethod
-    def calculate_on_time_rate(outcomes: List[Dict]) -> float:
+    def calculate_on_time_rate(outcomes: pd.DataFrame) -> float:
         """Calculate on-time submission rate"""
-        submitted = [o for o in outcomes if o.get('submitted_date')]
+        submitted = outcomes[outcomes['submitted_date'].notna()]
 
-        if not submitted:
+        if submitted.empty:
             return 1.0
 
-        on_time = sum(
-            1 for o in submitted
-            if o.get('submitted_date') and o.get('due_date')
-            and o['submitted_date'] <= o['due_date']
-        )
-
-        return on_time / len(submitted)
+        return float((submitted['submitted_date'] <= submitted['due_date']).mean())
 
     @staticmethod
-    def analyze_submission_patterns(outcomes: List[Dict]) -> SubmissionPattern:
+    def analyze_submission_patterns(outcomes: pd.DataFrame) -> SubmissionPattern:
         """
         Analyze submission timing patterns
 
         LEARNING CONCEPT: Distribution analysis
         """
-        days_before_deadline = []
-        early = on_time = late = 0
-        submission_hours = []
-        weekend_count = weekday_count = 0
-
-        for outcome in outcomes:
-            if not outcome.get('submitted_date') or not outcome.get('due_date'):
-                continue
-
-            delta = outcome['due_date'] - outcome['submitted_date']
-            days_before = delta.total_seconds() / (24 * 3600)
-            days_before_deadline.append(days_before)
-
-            # Classify
-            if days_before > 1:
-                early += 1
-            elif days_before >= 0:
-                on_time += 1
-            else:
-                late += 1
-
-            # Time patterns
-            submitted = outcome['submitted_date']
-            submission_hours.append(submitted.hour)
-
-            if submitted.weekday() >= 5:  # Saturday or Sunday
-                weekend_count += 1
-            else:
-                weekday_count += 1
+        timed = outcomes.dropna(subset=['submitted_date', 'due_date'])
 
         # Calculate statistics
-        if not days_before_deadline:
+        if timed.empty:
             return SubmissionPattern(
                 average_days_before_deadline=1.0,
                 median_days_before_deadline=1.0,
@@ -486,9 +801,27 @@ class PerformanceTrendAnalyzer:
                 last_minute_tendency=0.5
             )
 
-        avg_days = statistics.mean(days_before_deadline)
-        median_days = statistics.median(days_before_deadline)
-        std_dev = statistics.stdev(days_before_deadline) if len(days_before_deadline) > 1 else 0.0
+        submitted = timed['submitted_date']
+        days_before_deadline = (
+            (timed['due_date'] - submitted).dt.total_seconds().to_numpy(dtype=np.float64) / (24 * 3600)
+        )
+
+        # Classify: 0 = early (>1 day ahead), 1 = on time, 2 = late
+        category = np.where(days_before_deadline > 1, 0, np.where(days_before_deadline < 0, 2, 1))
+        early, on_time, late = (int(c) for c in np.bincount(category, minlength=3))
+
+        # Time patterns
+        weekdays = submitted.dt.weekday.to_numpy()
+        weekend_count = int(np.count_nonzero(weekdays >= 5))  # Saturday or Sunday
+        weekday_count = len(timed) - weekend_count
+
+        avg_days = float(days_before_deadline.mean())
+        median_days = float(np.median(days_before_deadline))
+        std_dev = float(days_before_deadline.std(ddof=1)) if len(timed) > 1 else 0.0
+
+        # Most common hour: a 24-bin histogram instead of a hash-based mode
+        hours = submitted.dt.hour.to_numpy(dtype=np.int64)
+        typical_hour = int(np.bincount(hours, minlength=24).argmax())
 
         # Last minute tendency (1 = very last minute, 0 = very early)
         last_minute_tendency = 1.0 - min(1.0, max(0.0, avg_days / 7.0))
@@ -500,19 +833,20 @@ class PerformanceTrendAnalyzer:
             early_submissions=early,
             on_time_submissions=on_time,
             late_submissions=late,
-            typical_submission_hour=statistics.mode(submission_hours) if submission_hours else 20,
+            typical_submission_hour=typical_hour,
             weekend_vs_weekday_ratio=weekend_count / max(weekday_count, 1),
             last_minute_tendency=last_minute_tendency
         )
 
     @staticmethod
-    def detect_grade_trend(grade_history: List[Tuple[datetime, float]]) -> GradeTrend:
+    def detect_grade_trend(grade_history: Tuple[np.ndarray, np.ndarray]) -> GradeTrend:
         """
         Detect grade trends using linear regression
 
         LEARNING CONCEPT: Simple linear regression
         """
-        if len(grade_history) < 3:
+        all_dates, all_grades = grade_history
+        if all_grades.size < 3:
             return GradeTrend(
                 current_average=0.0,
                 previous_period_average=0.0,
@@ -524,28 +858,23 @@ class PerformanceTrendAnalyzer:
             )
 
         # Calculate current average
-        recent_grades = [g for _, g in grade_history[-10:]]
-        current_avg = statistics.mean(recent_grades)
+        grades = all_grades[-20:]
+        current_avg = float(grades[-10:].mean())
 
         # Calculate previous period average
-        if len(grade_history) > 10:
-            previous_grades = [g for _, g in grade_history[-20:-10]]
-            if previous_grades:
-                previous_avg = statistics.mean(previous_grades)
-            else:
-                previous_avg = current_avg
-        else:
-            previous_avg = current_avg
+        previous_grades = grades[:-10]
+        previous_avg = float(previous_grades.mean()) if previous_grades.size else current_avg
 
-        # Simple trend detection
-        grade_diff = current_avg - previous_avg
+        # Least-squares fit of grade vs. calendar day over the whole history,
+        # so unevenly spaced submissions are weighted by when they happened
+        slope, r2 = PerformanceTrendAnalyzer._fit_daily_trend(all_dates, all_grades)
 
-        if grade_diff > 2:
+        if slope > 0.2:  # points per day
             trend_direction = "improving"
-            trend_strength = min(1.0, abs(grade_diff) / 10.0)
-        elif grade_diff < -2:
+            trend_strength = min(1.0, abs(slope) * 10) * r2
+        elif slope < -0.2:
             trend_direction = "declining"
-            trend_strength = min(1.0, abs(grade_diff) / 10.0)
+            trend_strength = min(1.0, abs(slope) * 10) * r2
         else:
             trend_direction = "stable"
             trend_strength = 0.2
@@ -560,6 +889,25 @@ class PerformanceTrendAnalyzer:
             struggling_courses=[]
         )
 
+    @staticmethod
+    def _fit_daily_trend(dates: np.ndarray, grades: np.ndarray) -> Tuple[float, float]:
+        """Slope (points/day) and r^2 of a degree-1 polyfit over dated grades"""
+        dated = ~np.isnat(dates)
+        dates, grades = dates[dated], grades[dated]
+        if grades.size < 2:
+            return 0.0, 0.0
+
+        t = (dates - dates[0]) / np.timedelta64(1, 'D')
+        if np.ptp(t) == 0:
+            return 0.0, 0.0  # All on the same instant: no slope to fit
+
+        slope, intercept = np.polyfit(t, grades, 1)
+        ss_res = float(((grades - (slope * t + intercept)) ** 2).sum())
+        ss_tot = float(((grades - grades.mean()) ** 2).sum())
+        r2 = 1.0 - ss_res / ss_tot if ss_tot else 0.0
+
+        return float(slope), r2
+
     @staticmethod
     def calculate_stress_level(upcoming_assignments: int,
                               total_hours_required: float,
@@ -569,20 +917,9 @@ class PerformanceTrendAnalyzer:
 
         LEARNING CONCEPT: Multi-factor stress scoring
         """
-        # Factor 1: Assignment density
-        assignments_per_day = upcoming_assignments / max(days_available, 1)
-
-        # Factor 2: Hours per day required
-        hours_per_day = total_hours_required / max(days_available, 1)
-
-        # Stress score (0-1)
-        stress_score = 0.0
-
-        # More than 2 assignments/day = high stress
-        stress_score += min(1.0, assignments_per_day / 2.0) * 0.4
-
-        # More than 8 hours/day = high stress
-        stress_score += min(1.0, hours_per_day / 8.0) * 0.6
+        stress_score = float(_stress_score(
+            int(upcoming_assignments), float(total_hours_required), float(days_available)
+        ))
 
         # Classify stress level
         if stress_score < 0.25:
@@ -617,6 +954,13 @@ class PerformanceAnalytics:
         self.database = PerformanceDatabase(storage_dir)
         self.trend_analyzer = PerformanceTrendAnalyzer()
 
+        # (days, max rowid, db version, upcoming) -> (computed_at, metrics)
+        self._cache: Dict[Tuple, Tuple[float, AcademicHealthMetrics]] = {}
+
+    TREND_WINDOW = 30  # graded submissions used for the grade trend
+    HEALTH_CACHE_TTL = 60.0  # seconds; reports depend on "now" too
+    HEALTH_CACHE_SIZE = 64
+
     def track_academic_health(self,
                              upcoming_assignments: List[Dict] = None,
                              days_to_analyze: int = 30) -> AcademicHealthMetrics:
@@ -624,37 +968,85 @@ class PerformanceAnalytics:
         Generate comprehensive academic health report
 
         This is the main entry point - returns complete health assessment
+
+        LEARNING CONCEPT: Result caching
+        Dashboards poll this repeatedly; unless an outcome was recorded or the
+        upcoming workload changed, the previous report is still valid.
         """
-        logger.info(f"Generating academic health report (last {days_to_analyze} days)")
+        max_rowid = self.database.db.execute(
+            "SELECT COALESCE(MAX(rowid), 0) FROM assignment_outcomes"
+        ).fetchone()[0]
+        key = (
+            days_to_analyze,
+            max_rowid,
+            self.database.version,
+            tuple(sorted(
+                (str(a.get('assignment_id')), str(a.get('due_date')), a.get('estimated_hours', 5))
+                for a in upcoming_assignments or ()
+            ))
+        )
 
-        # Get recent data
-        recent_outcomes = self.database.get_recent_outcomes(days=days_to_analyze)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and now - cached[0] < self.HEALTH_CACHE_TTL:
+            return cached[1]
+
+        metrics = self._compute_academic_health(upcoming_assignments, days_to_analyze)
 
-        # Calculate core metrics
-        completion_rate = self.trend_analyzer.calculate_completion_rate(recent_outcomes)
-        on_time_rate = self.trend_analyzer.calculate_on_time_rate(recent_outcomes)
+        if len(self._cache) >= self.HEALTH_CACHE_SIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = (now, metrics)
+        return metrics
+
+    def _compute_academic_health(self,
+                                 upcoming_assignments: Optional[List[Dict]],
+                                 days_to_analyze: int) -> AcademicHealthMetrics:
+        """Build the health report from the database (uncached)"""
+        logger.info(f"Generating academic health report (last {days_to_analyze} days)")
 
-        # Calculate average grade
-        grades = [o['percentage'] for o in recent_outcomes if o.get('percentage')]
-        avg_grade = statistics.mean(grades) if grades else None
+        # Scalar metrics come straight from SQL aggregates
+        aggregates = self.database.get_health_aggregates(days=days_to_analyze)
+        data_points = aggregates['n']
 
-        # Analyze submission patterns
-        submission_pattern = self.trend_analyzer.analyze_submission_patterns(recent_outcomes)
+        # Calculate core metrics (no data = assume good)
+        completion_rate = aggregates['completion_rate'] if data_points else 1.0
+        on_time_rate = aggregates['on_time_rate'] if aggregates['on_time_rate'] is not None else 1.0
+        avg_grade = aggregates['avg_grade']
+
+        # Row-level data is still needed for distributions and streaks
+        recent_outcomes = self.database.get_recent_outcomes(days=days_to_analyze)
 
-        # Analyze grade trend
-        grade_history = self.database.get_grade_history()
+        # Analyze grade trend over the most recent graded submissions; the
+        # recent window usually already holds them, saving a second scan
+        graded = recent_outcomes.dropna(subset=['submitted_date', 'percentage'])
+        if len(graded) >= self.TREND_WINDOW:
+            window = graded.iloc[self.TREND_WINDOW - 1::-1]  # Frame is newest first
+            grade_history = (
+                window['submitted_date'].to_numpy(dtype='datetime64[us]'),
+                window['percentage'].to_numpy(dtype=np.float64)
+            )
+        else:
+            grade_history = self.database.get_grade_history(limit=self.TREND_WINDOW)
         grade_trend = self.trend_analyzer.detect_grade_trend(grade_history)
 
         # Calculate stress level
         if upcoming_assignments:
             upcoming_count = len(upcoming_assignments)
-            total_hours = sum(a.get('estimated_hours', 5) for a in upcoming_assignments)
+            hours = np.fromiter(
+                (a.get('estimated_hours', 5) for a in upcoming_assignments),
+                dtype=np.float64, count=upcoming_count
+            )
+            due = np.array(
+                [a['due_date'].timestamp() for a in upcoming_assignments if a.get('due_date')],
+                dtype=np.float64
+            )
+            total_hours = float(hours.sum())
 
             # Days until nearest deadline
-            nearest_due = min(
-                (a['due_date'] for a in upcoming_assignments if a.get('due_date')),
-                default=datetime.now() + timedelta(days=7)
-            )
+            if due.size:
+                nearest_due = datetime.fromtimestamp(due.min())
+            else:
+                nearest_due = datetime.now() + timedelta(days=7)
             days_available = (nearest_due - datetime.now()).days
 
             stress_level, stress_score = self.trend_analyzer.calculate_stress_level(
@@ -667,18 +1059,20 @@ class PerformanceAnalytics:
             upcoming_count = 0
 
         # Count risk indicators
-        overdue = sum(1 for o in recent_outcomes
-                     if o.get('due_date') and not o.get('submitted_date')
-                     and o['due_date'] < datetime.now())
+        overdue = aggregates['overdue'] or 0
 
         consecutive_late = self._count_consecutive_late(recent_outcomes)
 
         # Days since last completion
-        if recent_outcomes and recent_outcomes[0].get('submitted_date'):
-            days_since_last = (datetime.now() - recent_outcomes[0]['submitted_date']).days
+        if aggregates['last_submission']:
+            last_submission = datetime.fromisoformat(aggregates['last_submission'])
+            days_since_last = (datetime.now() - last_submission).days
         else:
             days_since_last = 999
 
+        # Consecutive days with activity, from the daily rollup
+        streak_days = self._count_streak_days(self.database.get_daily_summaries(days=days_to_analyze))
+
         # Determine overall status
         overall_status = self._determine_overall_status(
             completion_rate,
@@ -703,10 +1097,10 @@ class PerformanceAnalytics:
             overdue_assignments=overdue,
             consecutive_late_submissions=consecutive_late,
             days_since_last_completion=days_since_last,
-            streak_days=0,  # Would calculate from daily activity
-            ahead_of_schedule_count=submission_pattern.early_submissions,
-            data_points_analyzed=len(recent_outcomes),
-            confidence_score=min(1.0, len(recent_outcomes) / 10.0)
+            streak_days=streak_days,
+            ahead_of_schedule_count=aggregates['early'] or 0,
+            data_points_analyzed=data_points,
+            confidence_score=min(1.0, data_points / 10.0)
         )
 
         logger.info(f"Health status: {overall_status.value}")
@@ -756,84 +1150,132 @@ class PerformanceAnalytics:
         # Default to good
         return AcademicHealthStatus.GOOD
 
-    def _count_consecutive_late(self, outcomes: List[Dict]) -> int:
-        """Count consecutive late submissions"""
-        consecutive = 0
-        max_consecutive = 0
+    def _count_consecutive_late(self, outcomes: pd.DataFrame) -> int:
+        """
+        Count the longest run of consecutive late submissions
 
-        for outcome in sorted(outcomes, key=lambda o: o.get('submitted_date') or datetime.min):
-            if not outcome.get('submitted_date') or not outcome.get('due_date'):
-                continue
+        LEARNING CONCEPT: Run-length detection
+        Padding the late flags with zeros makes np.diff mark every run start
+        with +1 and every run end with -1; run lengths are ends - starts.
+        """
+        timed = outcomes.dropna(subset=['submitted_date', 'due_date']).sort_values('submitted_date')
+        late = (timed['submitted_date'] > timed['due_date']).to_numpy(dtype=np.int8)
+        if not late.any():
+            return 0
 
-            if outcome['submitted_date'] > outcome['due_date']:
-                consecutive += 1
-                max_consecutive = max(max_consecutive, consecutive)
-            else:
-                consecutive = 0
+        edges = np.diff(np.concatenate(([0], late, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
 
-        return max_consecutive
+        return int((ends - starts).max())
+
+    def _count_streak_days(self, daily_summaries: List[sqlite3.Row]) -> int:
+        """Count consecutive active days ending today (or yesterday)"""
+        active_days = {
+            row['date'] for row in daily_summaries
+            if row['assignments_completed'] > 0 or row['study_minutes'] > 0
+        }
+
+        day = datetime.now().date()
+        if day.isoformat() not in active_days:
+            day -= timedelta(days=1)  # Today isn't over yet
+
+        streak = 0
+        while day.isoformat() in active_days:
+            streak += 1
+            day -= timedelta(days=1)
+
+        return streak
 
     def generate_insights(self, metrics: AcademicHealthMetrics) -> List[str]:
         """
         Generate actionable insights from metrics
 
         LEARNING CONCEPT: Rule-based insight generation
+        The rules only read a handful of fields, so identical signatures
+        share one cached result. Thresholds are decided on the exact rates;
+        only the displayed percentages are rounded.
         """
-        insights = []
+        completion_rate = metrics.assignment_completion_rate
+        on_time_rate = metrics.on_time_submission_rate
+        signature = (
+            -1 if completion_rate < 0.8 else (1 if completion_rate >= 0.95 else 0),
+            f"{completion_rate:.0%}",
+            on_time_rate < 0.7,
+            f"{on_time_rate:.0%}",
+            metrics.grade_trend,
+            metrics.current_stress_level.value,
+            metrics.overdue_assignments,
+            metrics.ahead_of_schedule_count
+        )
+        return list(_insights_for(signature))
 
-        # Completion rate insights
-        if metrics.assignment_completion_rate < 0.8:
-            insights.append(
-                f"⚠️ Completion rate is {metrics.assignment_completion_rate:.0%}. "
-                "Try breaking assignments into smaller tasks."
-            )
-        elif metrics.assignment_completion_rate >= 0.95:
-            insights.append(
-                f"✅ Excellent completion rate ({metrics.assignment_completion_rate:.0%})! Keep it up!"
-            )
 
-        # On-time submission insights
-        if metrics.on_time_submission_rate < 0.7:
-            insights.append(
-                f"⏰ Only {metrics.on_time_submission_rate:.0%} of assignments submitted on time. "
-                "Consider starting earlier or adjusting time estimates."
-            )
+@functools.lru_cache(maxsize=256)
+def _insights_for(signature: Tuple) -> Tuple[str, ...]:
+    """Insight messages for a generate_insights() signature"""
+    (completion_band, completion_pct, on_time_low, on_time_pct, grade_trend,
+     stress_level, overdue, ahead_of_schedule) = signature
+    insights = []
 
-        # Grade trend insights
-        if metrics.grade_trend == "improving":
-            insights.append("📈 Grades are trending upward - your hard work is paying off!")
-        elif metrics.grade_trend == "declining":
-            insights.append(
-                "📉 Grades are trending downward. Consider visiting office hours or adjusting study strategies."
-            )
+    # Completion rate insights (band: -1 below 80%, 1 at 95% or more)
+    if completion_band < 0:
+        insights.append(
+            f"⚠️ Completion rate is {completion_pct}. "
+            "Try breaking assignments into smaller tasks."
+        )
+    elif completion_band > 0:
+        insights.append(
+            f"✅ Excellent completion rate ({completion_pct})! Keep it up!"
+        )
 
-        # Stress insights
-        if metrics.current_stress_level == StressLevel.OVERWHELMING:
-            insights.append(
-                "🔥 Workload is overwhelming. Prioritize ruthlessly and consider extensions if needed."
-            )
-        elif metrics.current_stress_level == StressLevel.HIGH:
-            insights.append(
-                "😰 High stress detected. Focus on upcoming deadlines and avoid taking on new commitments."
-            )
+    # On-time submission insights
+    if on_time_low:
+        insights.append(
+            f"⏰ Only {on_time_pct} of assignments submitted on time. "
+            "Consider starting earlier or adjusting time estimates."
+        )
 
-        # Overdue insights
-        if metrics.overdue_assignments > 0:
-            insights.append(
-                f"🚨 {metrics.overdue_assignments} overdue assignment(s). Tackle these immediately!"
-            )
+    # Grade trend insights
+    if grade_trend == "improving":
+        insights.append("📈 Grades are trending upward - your hard work is paying off!")
+    elif grade_trend == "declining":
+        insights.append(
+            "📉 Grades are trending downward. Consider visiting office hours or adjusting study strategies."
+        )
 
-        # Positive reinforcement
-        if metrics.ahead_of_schedule_count >= 3:
-            insights.append(
-                f"🌟 {metrics.ahead_of_schedule_count} assignments completed early. Great planning!"
-            )
+    # Stress insights
+    if stress_level == StressLevel.OVERWHELMING.value:
+        insights.append(
+            "🔥 Workload is overwhelming. Prioritize ruthlessly and consider extensions if needed."
+        )
+    elif stress_level == StressLevel.HIGH.value:
+        insights.append(
+            "😰 High stress detected. Focus on upcoming deadlines and avoid taking on new commitments."
+        )
 
-        return insights
+    # Overdue insights
+    if overdue > 0:
+        insights.append(
+            f"🚨 {overdue} overdue assignment(s). Tackle these immediately!"
+        )
+
+    # Positive reinforcement
+    if ahead_of_schedule >= 3:
+        insights.append(
+            f"🌟 {ahead_of_schedule} assignments completed early. Great planning!"
+        )
+
+    return tuple(insights)
 
 
 # Example usage
 if __name__ == "__main__":
+    if sys.argv[1:] == ["refresh-daily-summaries"]:
+        PerformanceAnalytics().database.refresh_daily_summaries()
+        print("✅ daily_summaries rebuilt")
+        sys.exit(0)
+
     print("📊 Academic Performance Analytics")
     print("=" * 60)
     print()
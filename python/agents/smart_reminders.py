@@ -4,19 +4,85 @@ Smart Adaptive Reminder System
 Teaching concepts: Machine Learning for Estimation, Push Notifications, Adaptive Algorithms, Feature Engineering
 """
 
+import asyncio
 import json
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
 import logging
 from enum import Enum
 import hashlib
 from collections import defaultdict
+from bisect import bisect_right
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Keywords indicating prerequisite complexity
+_COMPLEX_KEYWORDS = (
+    'advanced', 'prerequisite', 'requires', 'must know',
+    'building on', 'continuation', 'extends', 'assumes'
+)
+
+# One automaton finds every keyword in a single pass over the text
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _COMPLEX_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_AUTOMATON = None
+
+def _hash_id(data: bytes) -> str:
+    """
+    Stable 128-bit hex id for assignments and reminders
+
+    BLAKE2b is in the standard library, faster than MD5 on short inputs,
+    and gives the same id on every install (no optional dependency).
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _hash_key(data: bytes) -> int:
+    """
+    Stable signed 64-bit id, used where the id is an INTEGER PRIMARY KEY
+
+    An integer key is SQLite's rowid itself: no separate TEXT index, and
+    lookups compare machine integers instead of 32-character strings.
+    """
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+# Characters of "title\ndescription" sent to the AI for complexity rating
+_EXCERPT_CHARS = 500
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """
+    Open one of the reminder system's SQLite stores
+
+    Local single-user stores: WAL lets reads run alongside a write and, with
+    synchronous=NORMAL, commits no longer fsync every time. Temp tables stay
+    in memory and reads go through mmap. Each connection lives as long as its
+    owner and keeps its prepared statements in the statement cache, so the
+    repeated lookups are parsed and planned once.
+    """
+    conn = sqlite3.connect(str(db_path), cached_statements=256)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -20000")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    return conn
+
 # LEARNING CONCEPT 1: Feature Engineering for ML
 # Transform raw data into features that predict difficulty
 
@@ -28,7 +94,58 @@ class DifficultyLevel(Enum):
     HARD = "hard"             # 8-15 hours
     VERY_HARD = "very_hard"   # > 15 hours
 
-@dataclass
+# Every feature _extract_features produces, in storage order. Estimates keep
+# them as a float32 vector in this order (NaN = not provided), and
+# difficulty_history stores that vector's bytes
+FEATURE_SCHEMA = (
+    'assignment_type_score',
+    'course_difficulty',
+    'length_complexity',
+    'points_score',
+    'requirements_count',
+    'time_available',
+    'prerequisites_score'
+)
+
+def _feature_vector(features: Dict[str, float]) -> np.ndarray:
+    """Pack a feature dict into a FEATURE_SCHEMA-ordered float32 vector"""
+    return np.array([features.get(key, np.nan) for key in FEATURE_SCHEMA], dtype=np.float32)
+
+# Difficulty score = weighted sum of these features (missing ones count as 0.5)
+_FEATURE_KEYS = (
+    'assignment_type_score',
+    'course_difficulty',
+    'length_complexity',
+    'prerequisites_score',
+    'time_available'
+)
+_FEATURE_WEIGHTS = (0.3, 0.25, 0.2, 0.15, 0.1)
+_FEATURE_COLUMNS = tuple(FEATURE_SCHEMA.index(key) for key in _FEATURE_KEYS)
+
+# Complexity by (lower-cased) assignment type; unknown types score 0.5
+_TYPE_COMPLEXITY = MappingProxyType({
+    'quiz': 0.1,
+    'homework': 0.3,
+    'lab': 0.4,
+    'essay': 0.6,
+    'project': 0.8,
+    'exam': 0.7,
+    'other': 0.5
+})
+
+# Score bands: index = number of cut points <= score (TRIVIAL below 0.2 ...)
+_DIFFICULTY_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+_DIFFICULTY_THRESHOLDS_ARRAY = np.array(_DIFFICULTY_THRESHOLDS)
+_DIFFICULTY_LEVELS = (
+    DifficultyLevel.TRIVIAL,
+    DifficultyLevel.EASY,
+    DifficultyLevel.MODERATE,
+    DifficultyLevel.HARD,
+    DifficultyLevel.VERY_HARD
+)
+_DIFFICULTY_HOURS = (0.5, 2.0, 5.0, 10.0, 20.0)
+
+@dataclass(slots=True)
 class DifficultyEstimate:
     """
     ML-based difficulty estimation
@@ -45,8 +162,8 @@ class DifficultyEstimate:
     prep_time_before_due: timedelta  # When to start
     work_time_before_due: timedelta  # When to do main work
 
-    # Feature breakdown (for explainability)
-    features_used: Dict[str, float] = field(default_factory=dict)
+    # Feature breakdown (for explainability), ordered as FEATURE_SCHEMA
+    features_used: np.ndarray = field(default_factory=lambda: _feature_vector({}))
     reasoning: str = ""
 
     # Adaptive timing
@@ -62,35 +179,49 @@ class DifficultyEstimate:
         """
         # Calculate base difficulty score (0-1)
         score = 0.0
+        for feature, weight in zip(_FEATURE_KEYS, _FEATURE_WEIGHTS):
+            score += features.get(feature, 0.5) * weight
 
-        # Weight different features
-        weights = {
-            'assignment_type_score': 0.3,
-            'course_difficulty': 0.25,
-            'length_complexity': 0.2,
-            'prerequisites_score': 0.15,
-            'time_available': 0.1
-        }
+        return cls._from_band(features, bisect_right(_DIFFICULTY_THRESHOLDS, score), _feature_vector(features))
 
-        for feature, weight in weights.items():
-            score += features.get(feature, 0.5) * weight
+    @classmethod
+    def from_features_batch(cls, feature_dicts: List[Dict[str, float]]) -> List['DifficultyEstimate']:
+        """
+        Create difficulty estimates for many assignments at once
+
+        LEARNING CONCEPT: Batched scoring
+        Features are stacked into one (N, len(FEATURE_SCHEMA)) matrix and
+        scored column by column, which adds the terms in the same order as
+        from_features, so both paths give bit-identical scores. One
+        searchsorted call then maps every score to its difficulty band, and
+        each estimate's features_used is a row of the float32 copy.
+        """
+        matrix = np.array(
+            [[features.get(key, np.nan) for key in FEATURE_SCHEMA] for features in feature_dicts],
+            dtype=np.float64
+        ).reshape(len(feature_dicts), len(FEATURE_SCHEMA))
+
+        scores = np.zeros(len(feature_dicts))
+        for column, weight in zip(_FEATURE_COLUMNS, _FEATURE_WEIGHTS):
+            values = matrix[:, column]
+            scores += np.where(np.isnan(values), 0.5, values) * weight
+
+        bands = np.searchsorted(_DIFFICULTY_THRESHOLDS_ARRAY, scores, side='right')
+        vectors = matrix.astype(np.float32)
+        return [
+            cls._from_band(features, band, vector)
+            for features, band, vector in zip(feature_dicts, bands.tolist(), vectors)
+        ]
 
-        # Map score to difficulty level
-        if score < 0.2:
-            level = DifficultyLevel.TRIVIAL
-            hours = 0.5
-        elif score < 0.4:
-            level = DifficultyLevel.EASY
-            hours = 2.0
-        elif score < 0.6:
-            level = DifficultyLevel.MODERATE
-            hours = 5.0
-        elif score < 0.8:
-            level = DifficultyLevel.HARD
-            hours = 10.0
-        else:
-            level = DifficultyLevel.VERY_HARD
-            hours = 20.0
+    @classmethod
+    def _from_band(cls,
+                   features: Dict[str, float],
+                   band: int,
+                   vector: np.ndarray) -> 'DifficultyEstimate':
+        """Build the estimate (level, timing, milestones) for a difficulty band"""
+        # Look up difficulty level and hours for the score band
+        level = _DIFFICULTY_LEVELS[band]
+        hours = _DIFFICULTY_HOURS[band]
 
         # Calculate timing recommendations
         prep_time = timedelta(days=max(2, int(hours / 3)))
@@ -134,7 +265,7 @@ class DifficultyEstimate:
             confidence=0.7,  # Would be calculated from feature variance
             prep_time_before_due=prep_time,
             work_time_before_due=work_time,
-            features_used=features,
+            features_used=vector,
             reasoning=f"Based on {len(features)} features, estimated as {level.value}",
             milestones=milestones
         )
@@ -161,10 +292,31 @@ class DifficultyPredictor:
         # Historical difficulty data
         self.difficulty_db = self._init_difficulty_db()
 
+        # course -> (computed_at, difficulty); cleared whenever history changes
+        self._course_difficulty_cache: Dict[str, Tuple[float, float]] = {}
+
+        # text hash -> AI complexity, in front of the text_complexity_cache table
+        self._complexity_cache: Dict[str, float] = {}
+
+        # Estimate rows are written by one background thread with its own
+        # connection; rows queued while it writes go out in its next batch
+        self._pending_estimates: List[Tuple] = []
+        self._pending_lock = threading.Lock()
+        self._flush_queued = False
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="difficulty-writer",
+            initializer=self._open_writer_db
+        )
+
+    COURSE_DIFFICULTY_TTL = 300.0  # seconds; another process may record history too
+    COMPLEXITY_CACHE_SIZE = 1024
+    MAX_CONCURRENT_ESTIMATES = 4  # Bounds in-flight AI calls during batch estimation
+
     def _init_difficulty_db(self) -> sqlite3.Connection:
         """Initialize database for storing difficulty history"""
         db_path = self.storage_dir / "difficulty_history.db"
-        conn = sqlite3.connect(str(db_path))
+        conn = _connect(db_path)
 
         conn.execute("""
             CREATE TABLE IF NOT EXISTS difficulty_history (
@@ -177,12 +329,34 @@ class DifficultyPredictor:
                 actual_hours REAL,
                 estimated_difficulty TEXT,
                 actual_difficulty TEXT,
-                features_json TEXT,
+                features_blob BLOB,  -- float32 vector ordered as FEATURE_SCHEMA
                 created_at DATETIME,
                 completed_at DATETIME
             )
         """)
 
+        # Databases from before features_blob kept features as JSON text
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(difficulty_history)")}
+        if 'features_blob' not in columns:
+            conn.execute("ALTER TABLE difficulty_history ADD COLUMN features_blob BLOB")
+
+        # AI complexity ratings by assignment text, so re-imports skip the LLM call
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS text_complexity_cache (
+                text_hash TEXT PRIMARY KEY,
+                complexity REAL,
+                reasoning TEXT,
+                created_at DATETIME
+            )
+        """)
+
+        # Course / course+type lookups only ever read completed rows; covers the AVG
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_difficulty_course
+            ON difficulty_history(course, assignment_type, created_at DESC, actual_hours)
+            WHERE actual_hours IS NOT NULL
+        """)
+
         conn.commit()
         return conn
 
@@ -210,11 +384,39 @@ class DifficultyPredictor:
         estimate = DifficultyEstimate.from_features(features)
 
         # Store estimate for future learning
-        self._store_estimate(assignment, estimate, features)
+        self._store_estimate(assignment, estimate)
 
         logger.info(f"Estimated difficulty: {estimate.difficulty_level.value} ({estimate.estimated_hours:.1f} hours)")
         return estimate
 
+    async def estimate_difficulty_batch(self, assignments: List[Dict[str, Any]]) -> List[DifficultyEstimate]:
+        """
+        Estimate difficulty for many assignments (e.g. a semester import)
+
+        LEARNING CONCEPT: Bounded concurrency
+        Feature extraction (which may call the AI) runs concurrently, capped
+        by a semaphore so the AI client is not flooded; all feature vectors
+        are then scored in one batched call.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_ESTIMATES)
+
+        async def features_for(assignment: Dict[str, Any]) -> Dict[str, float]:
+            async with semaphore:
+                features = await self._extract_features(assignment)
+            historical_estimate = self._get_historical_estimate(assignment, features)
+            if historical_estimate:
+                features = self._adjust_features_with_history(features, historical_estimate)
+            return features
+
+        all_features = await asyncio.gather(*(features_for(a) for a in assignments))
+        estimates = DifficultyEstimate.from_features_batch(all_features)
+
+        for assignment, estimate in zip(assignments, estimates):
+            self._store_estimate(assignment, estimate)
+
+        logger.info(f"Estimated difficulty for {len(estimates)} assignments")
+        return estimates
+
     async def _extract_features(self, assignment: Dict[str, Any]) -> Dict[str, float]:
         """
         Extract predictive features from assignment
@@ -225,26 +427,21 @@ class DifficultyPredictor:
         features = {}
 
         # Feature 1: Assignment type complexity
-        type_complexity = {
-            'quiz': 0.1,
-            'homework': 0.3,
-            'lab': 0.4,
-            'essay': 0.6,
-            'project': 0.8,
-            'exam': 0.7,
-            'other': 0.5
-        }
         assignment_type = assignment.get('type', 'other').lower()
-        features['assignment_type_score'] = type_complexity.get(assignment_type, 0.5)
+        features['assignment_type_score'] = _TYPE_COMPLEXITY.get(assignment_type, 0.5)
 
         # Feature 2: Course difficulty (would be learned over time)
         course = assignment.get('course', '')
         features['course_difficulty'] = self._get_course_difficulty(course)
 
-        # Feature 3: Length/complexity from description
+        # Feature 3: Length/complexity from description (and Feature 7 below,
+        # which reads the same text) - independent, so awaited together
         description = assignment.get('description', '')
         title = assignment.get('title', '')
-        features['length_complexity'] = await self._analyze_text_complexity(description, title)
+        features['length_complexity'], prerequisites_score = await asyncio.gather(
+            self._analyze_text_complexity(description, title),
+            self._analyze_prerequisites(description, title)
+        )
 
         # Feature 4: Points possible (normalized)
         points = assignment.get('points_possible', 100)
@@ -264,7 +461,7 @@ class DifficultyPredictor:
             features['time_available'] = 0.5
 
         # Feature 7: Prerequisites/dependencies mentioned
-        features['prerequisites_score'] = await self._analyze_prerequisites(description, title)
+        features['prerequisites_score'] = prerequisites_score
 
         logger.debug(f"Extracted {len(features)} features: {features}")
         return features
@@ -279,7 +476,17 @@ class DifficultyPredictor:
         if not course:
             return 0.5
 
-        # Query historical difficulty for this course
+        now = time.monotonic()
+        cached = self._course_difficulty_cache.get(course)
+        if cached and now - cached[0] < self.COURSE_DIFFICULTY_TTL:
+            return cached[1]
+
+        difficulty = self._query_course_difficulty(course)
+        self._course_difficulty_cache[course] = (now, difficulty)
+        return difficulty
+
+    def _query_course_difficulty(self, course: str) -> float:
+        """Average completed hours for a course, normalized to 0-1"""
         cursor = self.difficulty_db.execute("""
             SELECT AVG(actual_hours) as avg_hours
             FROM difficulty_history
@@ -300,19 +507,31 @@ class DifficultyPredictor:
         Analyze text to estimate complexity
 
         LEARNING CONCEPT: NLP for Feature Extraction
-        Use AI to understand assignment complexity from description
+        Use AI to understand assignment complexity from description.
+        Ratings are memoized by a hash of the exact text the model sees
+        (in memory, then in SQLite), so unchanged assignments are rated once.
         """
         if not description and not title:
             return 0.5
 
-        combined_text = f"{title}\n{description}"
+        # Same text as f"{title}\n{description}"[:500], without first copying
+        # a long description in full (the excerpt is also the cache key)
+        title, description = str(title), str(description)
+        excerpt = title[:_EXCERPT_CHARS]
+        if len(excerpt) < _EXCERPT_CHARS:
+            excerpt += "\n" + description[:_EXCERPT_CHARS - len(excerpt) - 1]
+        text_hash = _hash_id(excerpt.encode())
+
+        cached = self._cached_complexity(text_hash)
+        if cached is not None:
+            return cached
 
         # Use AI to analyze complexity
         complexity_prompt = f"""
 Analyze this assignment description and rate its complexity on a scale of 0-1.
 
 ASSIGNMENT:
-{combined_text[:500]}
+{excerpt}
 
 Consider:
 - Technical depth required
@@ -337,25 +556,59 @@ Output format: {{"complexity": 0.0-1.0, "reasoning": "brief explanation"}}
             analysis = json.loads(response)
             complexity = analysis.get('complexity', 0.5)
             logger.debug(f"Text complexity: {complexity} - {analysis.get('reasoning', '')}")
+            self._remember_complexity(text_hash, complexity, analysis.get('reasoning', ''))
             return complexity
 
         except Exception as e:
             logger.error(f"Text complexity analysis failed: {e}")
-            # Fallback: simple heuristics
-            word_count = len(combined_text.split())
+            # Fallback: simple heuristics (the newline keeps title and description words apart)
+            word_count = len(title.split()) + len(description.split())
             return min(1.0, word_count / 500)  # Longer = more complex
 
+    def _cached_complexity(self, text_hash: str) -> Optional[float]:
+        """AI complexity previously stored for this text, if any"""
+        complexity = self._complexity_cache.get(text_hash)
+        if complexity is not None:
+            return complexity
+
+        row = self.difficulty_db.execute(
+            "SELECT complexity FROM text_complexity_cache WHERE text_hash = ?",
+            (text_hash,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+
+        self._cache_complexity_in_memory(text_hash, row[0])
+        return row[0]
+
+    def _remember_complexity(self, text_hash: str, complexity: float, reasoning: str):
+        """Store an AI complexity rating in memory and in the database"""
+        self._cache_complexity_in_memory(text_hash, complexity)
+        try:
+            self.difficulty_db.execute("""
+                INSERT OR REPLACE INTO text_complexity_cache
+                (text_hash, complexity, reasoning, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (text_hash, complexity, reasoning, datetime.now()))
+            self.difficulty_db.commit()
+        except Exception as e:
+            logger.error(f"Failed to cache text complexity: {e}")
+
+    def _cache_complexity_in_memory(self, text_hash: str, complexity: float):
+        """Bounded in-process layer: evict the oldest entry when full"""
+        if len(self._complexity_cache) >= self.COMPLEXITY_CACHE_SIZE:
+            self._complexity_cache.pop(next(iter(self._complexity_cache)))
+        self._complexity_cache[text_hash] = complexity
+
     async def _analyze_prerequisites(self, description: str, title: str) -> float:
         """Detect prerequisite complexity from text"""
         combined = f"{title} {description}".lower()
 
-        # Keywords indicating complexity
-        complex_keywords = [
-            'advanced', 'prerequisite', 'requires', 'must know',
-            'building on', 'continuation', 'extends', 'assumes'
-        ]
-
-        matches = sum(1 for keyword in complex_keywords if keyword in combined)
+        # Each keyword counts once, however often it appears
+        if _KEYWORD_AUTOMATON is not None:
+            matches = len({keyword for _, keyword in _KEYWORD_AUTOMATON.iter(combined)})
+        else:
+            matches = sum(1 for keyword in _COMPLEX_KEYWORDS if keyword in combined)
         return min(1.0, matches / 5)
 
     def _get_historical_estimate(self,
@@ -369,8 +622,9 @@ Output format: {{"complexity": 0.0-1.0, "reasoning": "brief explanation"}}
         if not course:
             return None
 
+        # Only the hours are used, so the lookup is answered from the index alone
         cursor = self.difficulty_db.execute("""
-            SELECT assignment_title, actual_hours, features_json
+            SELECT actual_hours
             FROM difficulty_history
             WHERE course = ?
             AND assignment_type = ?
@@ -384,7 +638,7 @@ Output format: {{"complexity": 0.0-1.0, "reasoning": "brief explanation"}}
             return None
 
         # Average similar assignments
-        avg_hours = sum(r[1] for r in results) / len(results)
+        avg_hours = sum(r[0] for r in results) / len(results)
 
         return {
             'avg_hours': avg_hours,
@@ -414,32 +668,85 @@ Output format: {{"complexity": 0.0-1.0, "reasoning": "brief explanation"}}
 
     def _store_estimate(self,
                        assignment: Dict[str, Any],
-                       estimate: DifficultyEstimate,
-                       features: Dict[str, float]):
-        """Store estimate for future learning"""
-        assignment_hash = hashlib.md5(
-            f"{assignment.get('title', '')}{assignment.get('course', '')}".encode()
-        ).hexdigest()
+                       estimate: DifficultyEstimate):
+        """
+        Queue an estimate for storage (future learning)
+
+        LEARNING CONCEPT: Write-behind with group commit
+        The row is built here and handed to the writer thread, so estimation
+        never waits on SQLite. Rows that arrive while a batch is being
+        written are coalesced into the next executemany/commit.
+        """
+        course = assignment.get('course', '')
+        row = (
+            _hash_id(f"{assignment.get('title', '')}{course}".encode()),
+            assignment.get('title', ''),
+            course,
+            assignment.get('type', 'other'),
+            estimate.estimated_hours,
+            estimate.difficulty_level.value,
+            sqlite3.Binary(estimate.features_used.tobytes()),
+            datetime.now()
+        )
+
+        with self._pending_lock:
+            self._pending_estimates.append(row)
+            if not self._flush_queued:
+                self._flush_queued = True
+                self._db_executor.submit(self._flush_estimates)
+
+    def flush_pending_estimates(self):
+        """Block until every queued estimate has been written"""
+        self._db_executor.submit(self._flush_estimates).result()
+
+    def _open_writer_db(self):
+        """Runs on the writer thread: open the connection only it uses"""
+        self._writer_db = _connect(self.storage_dir / "difficulty_history.db")
+
+    def _flush_estimates(self):
+        """Runs on the writer thread: write every queued estimate in one transaction"""
+        with self._pending_lock:
+            rows, self._pending_estimates = self._pending_estimates, []
+            self._flush_queued = False
+
+        if not rows:
+            return
 
         try:
-            self.difficulty_db.execute("""
+            self._writer_db.executemany("""
                 INSERT OR REPLACE INTO difficulty_history
                 (assignment_hash, assignment_title, course, assignment_type,
-                 estimated_hours, estimated_difficulty, features_json, created_at)
+                 estimated_hours, estimated_difficulty, features_blob, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                assignment_hash,
-                assignment.get('title', ''),
-                assignment.get('course', ''),
-                assignment.get('type', 'other'),
-                estimate.estimated_hours,
-                estimate.difficulty_level.value,
-                json.dumps(features),
-                datetime.now()
-            ))
-            self.difficulty_db.commit()
+            """, rows)
+            self._writer_db.commit()
+            # REPLACE resets actual_hours if an assignment was completed before,
+            # which can only move its own course's average
+            for row in rows:
+                self._course_difficulty_cache.pop(row[2], None)
         except Exception as e:
-            logger.error(f"Failed to store difficulty estimate: {e}")
+            self._writer_db.rollback()
+            logger.error(f"Failed to store difficulty estimates: {e}")
+
+    def get_feature_history(self) -> np.ndarray:
+        """
+        Stored feature vectors as one (N, len(FEATURE_SCHEMA)) float32 matrix
+
+        LEARNING CONCEPT: Struct of Arrays
+        Each row's blob is raw float32 bytes, so the whole history decodes
+        with one frombuffer call into a matrix ready for batched scoring.
+        """
+        self.flush_pending_estimates()
+        blobs = self.difficulty_db.execute("""
+            SELECT features_blob
+            FROM difficulty_history
+            WHERE features_blob IS NOT NULL
+            ORDER BY id
+        """).fetchall()
+
+        return np.frombuffer(
+            b''.join(blob for blob, in blobs), dtype=np.float32
+        ).reshape(-1, len(FEATURE_SCHEMA))
 
     def record_actual_difficulty(self,
                                 assignment_hash: str,
@@ -451,6 +758,9 @@ Output format: {{"complexity": 0.0-1.0, "reasoning": "brief explanation"}}
         LEARNING CONCEPT: Active Learning Loop
         Learn from actual outcomes to improve future predictions
         """
+        # The estimate being completed may still be queued for the writer
+        self.flush_pending_estimates()
+
         try:
             self.difficulty_db.execute("""
                 UPDATE difficulty_history
@@ -460,6 +770,7 @@ Output format: {{"complexity": 0.0-1.0, "reasoning": "brief explanation"}}
                 WHERE assignment_hash = ?
             """, (actual_hours, actual_difficulty.value, datetime.now(), assignment_hash))
             self.difficulty_db.commit()
+            self._course_difficulty_cache.clear()
 
             logger.info(f"Recorded actual difficulty: {actual_hours:.1f} hours ({actual_difficulty.value})")
         except Exception as e:
@@ -468,7 +779,7 @@ Output format: {{"complexity": 0.0-1.0, "reasoning": "brief explanation"}}
 # LEARNING CONCEPT 3: Adaptive Reminder Scheduling
 # Reminders that adapt to user behavior and assignment difficulty
 
-@dataclass
+@dataclass(slots=True)
 class SmartReminder:
     """
     Intelligent reminder with adaptive timing
@@ -478,7 +789,7 @@ class SmartReminder:
     - Temporal scheduling
     - User behavior adaptation
     """
-    reminder_id: str
+    reminder_id: int
     assignment_id: str
     assignment_title: str
     reminder_type: str  # prep, start, progress, final, submit
@@ -507,6 +818,16 @@ class SmartReminder:
             'action_url': f"assignment://{self.assignment_id}"
         }
 
+# Lead time by reminder type until the user has response history
+_DEFAULT_REMINDER_LEADS = MappingProxyType({
+    'prep': timedelta(days=3),
+    'start': timedelta(days=2),
+    'progress': timedelta(days=1),
+    'final': timedelta(hours=6),
+    'submit': timedelta(hours=1)
+})
+_DEFAULT_REMINDER_LEAD = timedelta(days=1)
+
 class UserBehaviorAnalyzer:
     """
     Analyze user behavior to personalize reminders
@@ -521,25 +842,36 @@ class UserBehaviorAnalyzer:
         self.storage_dir = storage_dir
         self.behavior_db = self._init_behavior_db()
 
+        # reminder_type -> (computed_at, lead time); cleared on new interactions
+        self._timing_cache: Dict[str, Tuple[float, timedelta]] = {}
+
+    TIMING_CACHE_TTL = 300.0  # seconds
+
     def _init_behavior_db(self) -> sqlite3.Connection:
         """Initialize behavior tracking database"""
         db_path = self.storage_dir / "user_behavior.db"
-        conn = sqlite3.connect(str(db_path))
+        conn = _connect(db_path)
 
         conn.execute("""
             CREATE TABLE IF NOT EXISTS reminder_interactions (
                 id INTEGER PRIMARY KEY,
-                reminder_id TEXT,
+                reminder_id INTEGER,
                 reminder_type TEXT,
                 sent_at DATETIME,
                 opened_at DATETIME,
-                action_taken TEXT,  # dismissed, snoozed, completed
+                action_taken TEXT,  -- dismissed, snoozed, completed
                 time_to_action_seconds INTEGER,
                 assignment_completed BOOLEAN,
                 created_at DATETIME
             )
         """)
 
+        # Covers get_optimal_reminder_timing (filter and AVG column)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_interactions_type
+            ON reminder_interactions(reminder_type, action_taken, time_to_action_seconds)
+        """)
+
         conn.execute("""
             CREATE TABLE IF NOT EXISTS completion_patterns (
                 id INTEGER PRIMARY KEY,
@@ -554,54 +886,131 @@ class UserBehaviorAnalyzer:
             )
         """)
 
+        # Running totals per type, kept in step with completion_patterns so
+        # reads don't rescan the history
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS completion_patterns_rollup (
+                assignment_type TEXT PRIMARY KEY,
+                sum_hours REAL,
+                hours_count INTEGER,  -- rows with actual_hours, the avg_hours denominator
+                count INTEGER,
+                on_time_sum REAL,
+                start_on_time_sum REAL
+            )
+        """)
+
+        # Seed totals for history recorded before the rollup existed
+        conn.execute("""
+            INSERT OR IGNORE INTO completion_patterns_rollup
+            SELECT assignment_type,
+                   TOTAL(actual_hours),
+                   COUNT(actual_hours),
+                   COUNT(*),
+                   TOTAL(completed_on_time),
+                   TOTAL(started_on_time)
+            FROM completion_patterns
+            GROUP BY assignment_type
+        """)
+
         conn.commit()
         return conn
 
+    def record_completion_pattern(self,
+                                  assignment_type: str,
+                                  started_at: datetime,
+                                  completed_at: datetime,
+                                  estimated_hours: float,
+                                  actual_hours: Optional[float],
+                                  started_on_time: bool,
+                                  completed_on_time: bool):
+        """
+        Record how an assignment was actually completed
+
+        LEARNING CONCEPT: Incremental Materialized Aggregates
+        The raw row and the per-type totals are written in one transaction,
+        so get_completion_patterns is a point lookup however long the history.
+        """
+        try:
+            self.behavior_db.execute("""
+                INSERT INTO completion_patterns
+                (assignment_type, started_at, completed_at, estimated_hours,
+                 actual_hours, started_on_time, completed_on_time, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (assignment_type, started_at, completed_at, estimated_hours,
+                  actual_hours, started_on_time, completed_on_time, datetime.now()))
+
+            self.behavior_db.execute("""
+                INSERT INTO completion_patterns_rollup
+                (assignment_type, sum_hours, hours_count, count, on_time_sum, start_on_time_sum)
+                VALUES (?, COALESCE(?, 0), ?, 1, ?, ?)
+                ON CONFLICT(assignment_type) DO UPDATE SET
+                    sum_hours = sum_hours + excluded.sum_hours,
+                    hours_count = hours_count + excluded.hours_count,
+                    count = count + 1,
+                    on_time_sum = on_time_sum + excluded.on_time_sum,
+                    start_on_time_sum = start_on_time_sum + excluded.start_on_time_sum
+            """, (assignment_type, actual_hours, int(actual_hours is not None),
+                  float(completed_on_time), float(started_on_time)))
+
+            self.behavior_db.commit()
+        except Exception as e:
+            self.behavior_db.rollback()
+            logger.error(f"Failed to record completion pattern: {e}")
+
     def get_completion_patterns(self, assignment_type: str = None) -> Dict[str, Any]:
         """
         Analyze historical completion patterns
 
         LEARNING CONCEPT: Time Series Pattern Analysis
-        Extract behavioral patterns from historical data
+        Extract behavioral patterns from historical data, read from the
+        rollup that record_completion_pattern maintains
         """
         query = """
-            SELECT
-                assignment_type,
-                AVG(actual_hours) as avg_hours,
-                AVG(CAST(completed_on_time AS REAL)) as on_time_rate,
-                AVG(CAST(started_on_time AS REAL)) as start_on_time_rate,
-                COUNT(*) as sample_size
-            FROM completion_patterns
+            SELECT assignment_type, sum_hours, hours_count, count, on_time_sum, start_on_time_sum
+            FROM completion_patterns_rollup
         """
 
         params = []
         if assignment_type:
             query += " WHERE assignment_type = ?"
             params.append(assignment_type)
-
-        query += " GROUP BY assignment_type"
+        else:
+            query += " ORDER BY assignment_type"
 
         cursor = self.behavior_db.execute(query, params)
-        results = cursor.fetchall()
 
-        patterns = {}
-        for row in results:
-            patterns[row[0]] = {
-                'avg_hours': row[1],
-                'on_time_rate': row[2],
-                'start_on_time_rate': row[3],
-                'sample_size': row[4]
+        # Averages come straight from the running totals (like AVG, hours
+        # skip completions recorded without actual_hours)
+        return {
+            row_type: {
+                'avg_hours': sum_hours / hours_count if hours_count else None,
+                'on_time_rate': on_time_sum / count,
+                'start_on_time_rate': start_on_time_sum / count,
+                'sample_size': count
             }
-
-        return patterns
+            for row_type, sum_hours, hours_count, count, on_time_sum, start_on_time_sum
+            in cursor.fetchall()
+        }
 
     def get_optimal_reminder_timing(self, reminder_type: str) -> timedelta:
         """
         Calculate optimal reminder timing based on user response
 
         LEARNING CONCEPT: Response Time Optimization
-        Learn when user is most responsive to reminders
+        Learn when user is most responsive to reminders. Reminder creation
+        asks once per milestone, so answers are cached per type.
         """
+        now = time.monotonic()
+        cached = self._timing_cache.get(reminder_type)
+        if cached and now - cached[0] < self.TIMING_CACHE_TTL:
+            return cached[1]
+
+        timing = self._query_optimal_reminder_timing(reminder_type)
+        self._timing_cache[reminder_type] = (now, timing)
+        return timing
+
+    def _query_optimal_reminder_timing(self, reminder_type: str) -> timedelta:
+        """Average response time for a reminder type, or its default lead time"""
         cursor = self.behavior_db.execute("""
             SELECT AVG(time_to_action_seconds)
             FROM reminder_interactions
@@ -617,19 +1026,10 @@ class UserBehaviorAnalyzer:
             # Send reminder that much earlier
             return timedelta(seconds=avg_response_seconds)
 
-        # Defaults by reminder type
-        defaults = {
-            'prep': timedelta(days=3),
-            'start': timedelta(days=2),
-            'progress': timedelta(days=1),
-            'final': timedelta(hours=6),
-            'submit': timedelta(hours=1)
-        }
-
-        return defaults.get(reminder_type, timedelta(days=1))
+        return _DEFAULT_REMINDER_LEADS.get(reminder_type, _DEFAULT_REMINDER_LEAD)
 
     def record_reminder_interaction(self,
-                                   reminder_id: str,
+                                   reminder_id: int,
                                    reminder_type: str,
                                    action: str):
         """Record user interaction with reminder"""
@@ -640,9 +1040,27 @@ class UserBehaviorAnalyzer:
                 VALUES (?, ?, ?, ?, ?)
             """, (reminder_id, reminder_type, datetime.now(), action, datetime.now()))
             self.behavior_db.commit()
+            self._timing_cache.clear()
         except Exception as e:
             logger.error(f"Failed to record reminder interaction: {e}")
 
+# Reminder message per milestone name, formatted on demand
+_REMINDER_MESSAGE_TEMPLATES = {
+    'Research & Planning': "Time to start planning '{title}'. "
+                           "Estimated time: {hours:.1f} hours. "
+                           "{description}",
+
+    'First Draft / Initial Work': "Start working on '{title}'. "
+                                  "Block out {hours:.1f} hours. "
+                                  "{description}",
+
+    'Review & Polish': "Review your work on '{title}'. "
+                       "Set aside {hours:.1f} hours for final touches.",
+
+    'Final Submission': "⏰ Submit '{title}' soon! "
+                        "Due in 1 hour. Double-check requirements."
+}
+
 # Main Smart Reminders class
 class SmartReminders:
     """
@@ -672,23 +1090,30 @@ class SmartReminders:
     def _init_reminders_db(self) -> sqlite3.Connection:
         """Initialize reminders database"""
         db_path = self.storage_dir / "reminders.db"
-        conn = sqlite3.connect(str(db_path))
+        conn = _connect(db_path)
 
         conn.execute("""
             CREATE TABLE IF NOT EXISTS reminders (
-                reminder_id TEXT PRIMARY KEY,
+                reminder_id INTEGER PRIMARY KEY,  -- rowid alias, see _hash_key
                 assignment_id TEXT,
                 assignment_title TEXT,
                 reminder_type TEXT,
-                scheduled_time DATETIME,
+                scheduled_time INTEGER,  -- Unix seconds, like sent_at and created_at
                 message TEXT,
                 importance REAL,
                 is_sent BOOLEAN DEFAULT 0,
-                sent_at DATETIME,
-                created_at DATETIME
+                sent_at INTEGER,
+                created_at INTEGER
             )
         """)
 
+        # Pending reminders only: sent ones drop out of the index
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reminders_pending
+            ON reminders(scheduled_time)
+            WHERE is_sent = 0
+        """)
+
         conn.commit()
         return conn
 
@@ -720,12 +1145,14 @@ class SmartReminders:
 
         # Create reminder for each milestone
         for milestone in difficulty.milestones:
+            milestone_name = milestone['name'].lower()
+
             # Calculate reminder time with adaptive adjustment
             base_reminder_time = due_date - milestone['time_before_due']
 
             # Adjust based on user behavior
             optimal_lead = self.behavior_analyzer.get_optimal_reminder_timing(
-                milestone['name'].lower().split()[0]  # First word as type
+                milestone_name.split()[0]  # First word as type
             )
 
             # Apply adjustment if user has history
@@ -737,9 +1164,9 @@ class SmartReminders:
                     base_reminder_time -= timedelta(hours=12)
 
             # Create reminder
-            reminder_id = hashlib.md5(
+            reminder_id = _hash_key(
                 f"{assignment.get('title', '')}{milestone['name']}{base_reminder_time}".encode()
-            ).hexdigest()
+            )
 
             message = self._generate_reminder_message(
                 assignment,
@@ -751,7 +1178,7 @@ class SmartReminders:
                 reminder_id=reminder_id,
                 assignment_id=assignment.get('id', ''),
                 assignment_title=assignment.get('title', 'Assignment'),
-                reminder_type=milestone['name'].lower().replace(' ', '_'),
+                reminder_type=milestone_name.replace(' ', '_'),
                 scheduled_time=base_reminder_time,
                 message=message,
                 importance=difficulty.estimated_hours / 20.0,  # Normalize to 0-1
@@ -760,8 +1187,8 @@ class SmartReminders:
 
             reminders.append(reminder)
 
-            # Store in database
-            self._store_reminder(reminder)
+        # Store all milestones in one transaction (one commit, not one per reminder)
+        self._store_reminders(reminders)
 
         logger.info(f"Created {len(reminders)} adaptive reminders for {assignment.get('title')}")
         return reminders
@@ -770,49 +1197,63 @@ class SmartReminders:
                                    assignment: Dict[str, Any],
                                    milestone: Dict[str, Any],
                                    difficulty: DifficultyEstimate) -> str:
-        """Generate contextual reminder message"""
-        messages = {
-            'Research & Planning': f"Time to start planning '{assignment.get('title')}'. "
-                                 f"Estimated time: {milestone['duration_hours']:.1f} hours. "
-                                 f"{milestone['description']}",
-
-            'First Draft / Initial Work': f"Start working on '{assignment.get('title')}'. "
-                                         f"Block out {milestone['duration_hours']:.1f} hours. "
-                                         f"{milestone['description']}",
-
-            'Review & Polish': f"Review your work on '{assignment.get('title')}'. "
-                             f"Set aside {milestone['duration_hours']:.1f} hours for final touches.",
+        """Generate contextual reminder message (only the milestone's own template is formatted)"""
+        template = _REMINDER_MESSAGE_TEMPLATES.get(milestone['name'])
+        if template is None:
+            return milestone['description']
+
+        return template.format(
+            title=assignment.get('title'),
+            hours=milestone['duration_hours'],
+            description=milestone['description']
+        )
 
-            'Final Submission': f"⏰ Submit '{assignment.get('title')}' soon! "
-                              f"Due in 1 hour. Double-check requirements."
-        }
+    def _store_reminders(self, reminders: List[SmartReminder]):
+        """
+        Store reminders in database
 
-        return messages.get(milestone['name'], milestone['description'])
+        LEARNING CONCEPT: Batched writes
+        executemany inserts every row inside one transaction, so the batch
+        costs a single commit (and fsync) instead of one per reminder.
+        """
+        if not reminders:
+            return
 
-    def _store_reminder(self, reminder: SmartReminder):
-        """Store reminder in database"""
+        now_ts = int(time.time())
         try:
-            self.reminders_db.execute("""
+            self.reminders_db.executemany("""
                 INSERT OR REPLACE INTO reminders
                 (reminder_id, assignment_id, assignment_title, reminder_type,
                  scheduled_time, message, importance, is_sent, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)
-            """, (
-                reminder.reminder_id,
-                reminder.assignment_id,
-                reminder.assignment_title,
-                reminder.reminder_type,
-                reminder.scheduled_time,
-                reminder.message,
-                reminder.importance,
-                datetime.now()
-            ))
+            """, [
+                (
+                    reminder.reminder_id,
+                    reminder.assignment_id,
+                    reminder.assignment_title,
+                    reminder.reminder_type,
+                    int(reminder.scheduled_time.timestamp()),
+                    reminder.message,
+                    reminder.importance,
+                    now_ts
+                )
+                for reminder in reminders
+            ])
             self.reminders_db.commit()
         except Exception as e:
-            logger.error(f"Failed to store reminder: {e}")
+            self.reminders_db.rollback()
+            logger.error(f"Failed to store reminders: {e}")
+
+    def get_pending_reminders(self, as_of: Optional[datetime] = None) -> List[SmartReminder]:
+        """
+        Get all pending reminders that should be sent (by `as_of`, default now)
 
-    def get_pending_reminders(self) -> List[SmartReminder]:
-        """Get all pending reminders that should be sent"""
+        Rows are unpacked straight into SmartReminder's positional fields,
+        in the order they are selected. Times are stored as Unix seconds, so
+        the filter is an integer comparison and each row converts back with
+        one fromtimestamp call.
+        """
+        as_of_ts = int((as_of or datetime.now()).timestamp())
         cursor = self.reminders_db.execute("""
             SELECT reminder_id, assignment_id, assignment_title, reminder_type,
                    scheduled_time, message, importance
@@ -820,32 +1261,24 @@ class SmartReminders:
             WHERE is_sent = 0
             AND scheduled_time <= ?
             ORDER BY importance DESC, scheduled_time ASC
-        """, (datetime.now(),))
-
-        reminders = []
-        for row in cursor.fetchall():
-            reminder = SmartReminder(
-                reminder_id=row[0],
-                assignment_id=row[1],
-                assignment_title=row[2],
-                reminder_type=row[3],
-                scheduled_time=datetime.fromisoformat(row[4]),
-                message=row[5],
-                importance=row[6],
-                is_sent=False
-            )
-            reminders.append(reminder)
-
-        return reminders
+        """, (as_of_ts,))
+
+        parse_time = datetime.fromtimestamp
+        return [
+            SmartReminder(reminder_id, assignment_id, title, reminder_type,
+                          parse_time(scheduled_time), message, importance)
+            for (reminder_id, assignment_id, title, reminder_type,
+                 scheduled_time, message, importance) in cursor.fetchall()
+        ]
 
-    def mark_reminder_sent(self, reminder_id: str):
+    def mark_reminder_sent(self, reminder_id: int):
         """Mark reminder as sent"""
         try:
             self.reminders_db.execute("""
                 UPDATE reminders
                 SET is_sent = 1, sent_at = ?
                 WHERE reminder_id = ?
-            """, (datetime.now(), reminder_id))
+            """, (int(time.time()), reminder_id))
             self.reminders_db.commit()
         except Exception as e:
             logger.error(f"Failed to mark reminder sent: {e}")
@@ -6,7 +6,11 @@ Teaching concepts: Computer Vision + AI, Browser Automation, Prompt Engineering
 
 import asyncio
 import base64
+import copy
+import hashlib
 import json
+from collections import OrderedDict
+from io import BytesIO
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime
@@ -18,8 +22,45 @@ try:
 except ImportError:
     print("Install playwright: pip install playwright")
 
+# Optional: without Pillow, screenshots are sent at viewport size
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 logger = logging.getLogger(__name__)
 
+def _downscale_jpeg(screenshot: bytes, max_dim: int) -> bytes:
+    """Shrink a JPEG so its longer side is at most max_dim pixels"""
+    image = Image.open(BytesIO(screenshot))
+    if max(image.size) <= max_dim:
+        return screenshot
+
+    image.thumbnail((max_dim, max_dim), Image.BILINEAR)
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=75)
+    return buffer.getvalue()
+
+# Potentially clickable elements, tried in this order by fuzzy matching
+_CLICKABLE_SELECTORS = (
+    'button', 'a', 'input[type="submit"]', 'input[type="button"]',
+    '[role="button"]', '[onclick]', '.btn', '.button'
+)
+
+# Index of the first element whose text, title and aria-label contain at
+# least half of the description's words (-1 if none)
+_FUZZY_MATCH_JS = """
+(elements, words) => elements.findIndex(element => {
+    const elementText = [
+        element.textContent || '',
+        element.getAttribute('title') || '',
+        element.getAttribute('aria-label') || ''
+    ].join(' ').toLowerCase();
+    const matches = words.filter(word => elementText.includes(word)).length;
+    return matches >= words.length * 0.5;  // 50% word match threshold
+})
+"""
+
 # LEARNING CONCEPT 1: Computer Vision + Language Models
 # GPT-4V can "see" and understand screenshots like a human
 # This is a breakthrough in automation - no more brittle selectors!
@@ -60,6 +101,14 @@ class VisualBrowserAgent:
         self.navigation_history: List[Dict] = []
         self.learned_patterns: Dict[str, Any] = {}
 
+        # AI results by (screenshot digest, goal or URL); a changed page
+        # gives a new digest, so stale entries are simply never hit
+        self._plan_cache: OrderedDict = OrderedDict()
+        self._extraction_cache: OrderedDict = OrderedDict()
+
+    ANALYSIS_CACHE_SIZE = 128
+    SCREENSHOT_MAX_DIM = 896  # Longest side sent to the vision model, in pixels
+
     async def initialize(self):
         """Initialize browser instance"""
         self.playwright = await async_playwright().start()
@@ -99,9 +148,17 @@ class VisualBrowserAgent:
         Use GPT-4V to analyze current page and plan navigation
 
         This is the core innovation: instead of hardcoded selectors,
-        we use AI to understand the page visually
+        we use AI to understand the page visually. Plans are memoized by
+        screenshot and goal, so asking again about an identical page skips
+        the GPT-4V round-trip. Plans whose execution fails are forgotten
+        (see execute_navigation_plan) so a retry gets a fresh analysis.
         """
         screenshot = await self.take_screenshot()
+        cache_key = (self._screenshot_digest(screenshot), goal)
+        cached_plan = self._cache_lookup(self._plan_cache, cache_key)
+        if cached_plan is not None:
+            logger.info("Navigation plan reused for unchanged page")
+            return cached_plan
 
         # PROMPT ENGINEERING: This prompt is carefully crafted to get useful navigation instructions
         analysis_prompt = f"""
@@ -167,6 +224,7 @@ class VisualBrowserAgent:
             )
 
             logger.info(f"Navigation plan generated with {plan.confidence:.2f} confidence")
+            self._cache_store(self._plan_cache, cache_key, plan)
             return plan
 
         except Exception as e:
@@ -224,7 +282,10 @@ class VisualBrowserAgent:
         success_rate = success_count / len(plan.steps) if plan.steps else 0
         logger.info(f"Navigation completed: {success_count}/{len(plan.steps)} steps successful ({success_rate:.1%})")
 
-        return success_rate >= 0.7  # Consider 70% success rate as acceptable
+        succeeded = success_rate >= 0.7  # Consider 70% success rate as acceptable
+        if not succeeded:
+            self._forget_plan(plan)
+        return succeeded
 
     async def _execute_single_step(self, step: Dict[str, Any]) -> bool:
         """Execute a single navigation step"""
@@ -257,28 +318,43 @@ class VisualBrowserAgent:
         """
         Click an element using multiple location strategies
 
-        This shows how to make automation robust by trying multiple approaches
+        This shows how to make automation robust by trying multiple approaches.
+        The strategies only look elements up, so they all run at once; their
+        results are still taken in priority order, and exactly one element
+        is clicked.
         """
         strategies = [
-            self._click_by_text,
-            self._click_by_role,
-            self._click_by_ai_coordinates,
-            self._click_by_fuzzy_match
+            self._locate_by_text,
+            self._locate_by_role,
+            self._locate_by_ai_coordinates,
+            self._locate_by_fuzzy_match
         ]
+        tasks = [asyncio.create_task(strategy(description)) for strategy in strategies]
 
-        for strategy in strategies:
-            try:
-                if await strategy(description):
+        try:
+            for strategy, task in zip(strategies, tasks):
+                try:
+                    # Later strategies keep running while an earlier one is awaited
+                    element = await task
+                    if element is None:
+                        continue
+
+                    await element.click()
                     return True
-            except Exception as e:
-                logger.debug(f"Strategy {strategy.__name__} failed: {e}")
-                continue
+                except Exception as e:
+                    logger.debug(f"Strategy {strategy.__name__} failed: {e}")
+                    continue
+        finally:
+            # Stop lookups that are no longer needed (and collect their results)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         logger.error(f"All click strategies failed for: {description}")
         return False
 
-    async def _click_by_text(self, description: str) -> bool:
-        """Try to click by visible text content"""
+    async def _locate_by_text(self, description: str) -> Optional[Any]:
+        """Find an element by visible text content"""
         # Extract likely text from description
         text_variants = [
             description.lower(),
@@ -294,22 +370,20 @@ class VisualBrowserAgent:
                 # Try exact text match first
                 element = self.page.locator(f"text={text}")
                 if await element.count() > 0:
-                    await element.first.click()
-                    return True
+                    return element.first
 
                 # Try partial text match
                 element = self.page.locator(f"text*={text}")
                 if await element.count() > 0:
-                    await element.first.click()
-                    return True
+                    return element.first
 
             except Exception:
                 continue
 
-        return False
+        return None
 
-    async def _click_by_role(self, description: str) -> bool:
-        """Try to click using ARIA roles"""
+    async def _locate_by_role(self, description: str) -> Optional[Any]:
+        """Find an element using ARIA roles"""
         role_mapping = {
             'button': 'button',
             'link': 'link',
@@ -317,67 +391,53 @@ class VisualBrowserAgent:
             'submit': 'button',
             'login': 'button'
         }
+        description_words = description.lower().split()
 
         for keyword, role in role_mapping.items():
             if keyword in description.lower():
                 try:
                     elements = self.page.get_by_role(role)
-                    count = await elements.count()
+                    # One round-trip for every element's text, not one per element
+                    texts = await elements.all_text_contents()
 
-                    for i in range(count):
-                        element = elements.nth(i)
-                        text = await element.text_content() or ""
-                        if any(word in text.lower() for word in description.lower().split()):
-                            await element.click()
-                            return True
+                    for i, text in enumerate(texts):
+                        if any(word in text.lower() for word in description_words):
+                            return elements.nth(i)
 
                 except Exception:
                     continue
 
-        return False
+        return None
 
-    async def _click_by_ai_coordinates(self, description: str) -> bool:
-        """Use AI to identify element coordinates and click there"""
+    async def _locate_by_ai_coordinates(self, description: str) -> Optional[Any]:
+        """Use AI to identify element coordinates"""
         # This would use GPT-4V to identify specific coordinates
         # For now, we'll simulate this approach
         logger.debug(f"AI coordinate clicking not implemented for: {description}")
-        return False
+        return None
 
-    async def _click_by_fuzzy_match(self, description: str) -> bool:
-        """Try fuzzy matching against all clickable elements"""
+    async def _locate_by_fuzzy_match(self, description: str) -> Optional[Any]:
+        """
+        Try fuzzy matching against all clickable elements
+
+        The matching runs inside the browser: one evaluate_all per selector
+        returns the index of the first matching element, instead of three
+        round-trips (text, title, aria-label) for every element on the page.
+        """
         try:
-            # Get all potentially clickable elements
-            clickable_selectors = [
-                'button', 'a', 'input[type="submit"]', 'input[type="button"]',
-                '[role="button"]', '[onclick]', '.btn', '.button'
-            ]
+            description_words = description.lower().split()
 
-            for selector in clickable_selectors:
+            for selector in _CLICKABLE_SELECTORS:
                 elements = self.page.locator(selector)
-                count = await elements.count()
-
-                for i in range(count):
-                    element = elements.nth(i)
-                    # Get element text and attributes
-                    text = await element.text_content() or ""
-                    title = await element.get_attribute('title') or ""
-                    aria_label = await element.get_attribute('aria-label') or ""
-
-                    # Combine all text for matching
-                    element_text = f"{text} {title} {aria_label}".lower()
+                index = await elements.evaluate_all(_FUZZY_MATCH_JS, description_words)
 
-                    # Simple fuzzy matching
-                    description_words = description.lower().split()
-                    matches = sum(1 for word in description_words if word in element_text)
-
-                    if matches >= len(description_words) * 0.5:  # 50% word match threshold
-                        await element.click()
-                        return True
+                if index >= 0:
+                    return elements.nth(index)
 
         except Exception as e:
             logger.error(f"Fuzzy matching failed: {e}")
 
-        return False
+        return None
 
     async def _type_text(self, target: str, text: str) -> bool:
         """Type text into form fields"""
@@ -399,16 +459,56 @@ class VisualBrowserAgent:
 
         return False
 
-    async def take_screenshot(self) -> bytes:
-        """Take screenshot for AI analysis"""
+    async def take_screenshot(self, max_dim: Optional[int] = None) -> bytes:
+        """
+        Take screenshot for AI analysis
+
+        LEARNING CONCEPT: Preprocess before the model sees it
+        Vision models bill by image tiles, so a JPEG capped at max_dim
+        pixels is several times cheaper (and faster to upload) than a
+        full-viewport PNG while still readable.
+        """
         if not self.page:
             raise Exception("Browser not initialized")
 
         screenshot = await self.page.screenshot(
             full_page=False,  # Just visible area
-            quality=85        # Compress slightly to reduce token usage
+            type='jpeg',      # PNG ignores quality; JPEG is far smaller
+            quality=70
         )
-        return screenshot
+
+        if Image is None:
+            return screenshot
+
+        # Decode/resize/encode is CPU work; keep it off the event loop
+        return await asyncio.to_thread(
+            _downscale_jpeg, screenshot, max_dim or self.SCREENSHOT_MAX_DIM
+        )
+
+    @staticmethod
+    def _screenshot_digest(screenshot: bytes) -> bytes:
+        """Exact-content digest of a screenshot, used in analysis cache keys"""
+        return hashlib.blake2b(screenshot, digest_size=16).digest()
+
+    def _cache_lookup(self, cache: OrderedDict, key: Tuple) -> Any:
+        """Cached AI result for key (marked most recently used), or None"""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    def _cache_store(self, cache: OrderedDict, key: Tuple, value: Any):
+        """Remember an AI result, evicting the least recently used past the cap"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.ANALYSIS_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _forget_plan(self, plan: NavigationPlan):
+        """Drop a plan that failed to execute so the page is re-analyzed next time"""
+        for key, cached_plan in list(self._plan_cache.items()):
+            if cached_plan is plan:
+                del self._plan_cache[key]
 
     async def navigate_to_assignments(self, platform_url: str, credentials: Dict[str, str]) -> List[Dict]:
         """
@@ -471,6 +571,12 @@ class VisualBrowserAgent:
     async def _extract_assignments_from_page(self) -> List[Dict]:
         """Extract assignment data from current page using AI"""
         screenshot = await self.take_screenshot()
+        cache_key = (self._screenshot_digest(screenshot), self.page.url)
+        cached_assignments = self._cache_lookup(self._extraction_cache, cache_key)
+        if cached_assignments is not None:
+            logger.info(f"Reused {len(cached_assignments)} assignments extracted from unchanged page")
+            return copy.deepcopy(cached_assignments)  # Callers may edit their list
+
         page_content = await self.page.content()
 
         extraction_prompt = f"""
@@ -508,6 +614,7 @@ class VisualBrowserAgent:
 
             assignments = json.loads(response)
             logger.info(f"Extracted {len(assignments)} assignments from page")
+            self._cache_store(self._extraction_cache, cache_key, copy.deepcopy(assignments))
             return assignments
 
         except Exception as e: